@@ -6,6 +6,10 @@ EXIT_HOTKEY = "ctrl+shift+q"
 SAVES_DIR_NAME = "saves"
 DEFAULT_PANEL_KEY = "home"
 DEFAULT_AUTO_PANEL = True
+MAX_LOG_LINES = 500  # oldest debug log rows are dropped beyond this
+LAST_PROFILE_LOAD_DELAY_MS = 50  # startup auto-load waits this long so the window paints first
+LOG_DRAIN_MS = 100  # how often queued log lines are shown and echoed to stdout
+PROGRESS_TICK_MS = 33  # one shared ~30 Hz tick redraws every running overlay fill
 
 # Describes the slot label and the keyboard hotkey used by the listener.
 NUMPAD_SLOTS = (
@@ -20,6 +24,8 @@ NUMPAD_SLOTS = (
     ("3", "num 3"),
 )
 
+NUMPAD_SLOT_NAMES: tuple[str, ...] = tuple(slot for slot, _ in NUMPAD_SLOTS)
+
 DEFAULT_SLOT_HOTKEYS = {slot: key for slot, key in NUMPAD_SLOTS}
 # Default arrow-key mapping used by stratagem direction sequences.
 DEFAULT_DIRECTION_KEYS = {
@@ -28,6 +34,7 @@ DEFAULT_DIRECTION_KEYS = {
     "Left": "left",
     "Right": "right",
 }
+DIRECTION_NAMES = tuple(DEFAULT_DIRECTION_KEYS)
 
 DEFAULT_OVERLAY_LOCK_KEY = "`"
 DEFAULT_OVERLAY_OPACITY = 0.82
@@ -1,3 +1,4 @@
+import sys
 from typing import Callable
 
 _log_callback: Callable[[str], None] | None = None
@@ -21,3 +22,10 @@ def log(message: str) -> None:
             # Fall back to stdout if the UI logger fails.
             pass
     print(message)
+
+
+def log_lazy(fmt: str, *args: object) -> None:
+    """Like log(), but skips %-formatting entirely when nothing would show it."""
+    if _log_callback is None and sys.stdout is None:
+        return
+    log(fmt % args if args else fmt)
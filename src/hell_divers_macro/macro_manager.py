@@ -2,18 +2,47 @@ from __future__ import annotations
 
 """Keyboard macro registration and execution utilities."""
 
+import queue
+import sys
 import threading
 import time
-from typing import Callable, Dict, Iterable
+from typing import Callable, Dict
 
 import keyboard
 
 from hell_divers_macro.config import DEFAULT_AUTO_PANEL, DEFAULT_PANEL_KEY
-from hell_divers_macro.log_utils import log
-from hell_divers_macro.models import HotkeyHandle, Macro, MacroRecord
+from hell_divers_macro.log_utils import log_lazy
+from hell_divers_macro.models import Macro, MacroRecord
+from hell_divers_macro.native_hook import IS_WINDOWS, NativeKeyHook
+from hell_divers_macro.rawsend import (
+    PreparedKey,
+    ResolvedKey,
+    prepare_sequence,
+    resolve_key,
+    run_prepared,
+)
 
 MacroProgressCallback = Callable[[str, Macro, str | None, float | None], None]
 
+# (hotkey_lower, slot, label), computed once at registration.
+MacroMeta = tuple[str, str | None, str]
+
+# Prebuilt send payloads and total runtime for one trigger.
+MacroPlan = tuple[tuple[PreparedKey, ...], float]
+
+# The keyboard backends tag every event with these exact constant objects,
+# so identity checks are safe and cheaper than string comparison.
+_KEY_DOWN = keyboard.KEY_DOWN
+# Arrow names that share numpad scancodes when the backend can't tell them apart.
+_ARROWS = frozenset(("up", "down", "left", "right"))
+
+# Presses arriving this soon after a release of the same key are treated as
+# OS key-repeat bounce; the first press after idle is never delayed.
+DEFAULT_REPEAT_DEBOUNCE = 0.002
+
+# One byte per possible 16-bit scancode; nonzero while that key is held.
+_SCANCODE_SPACE = 0x10000
+
 
 class MacroManager:
     """Manage keyboard listeners for macro hotkeys."""
@@ -24,19 +53,64 @@ class MacroManager:
         *,
         auto_panel_key: str = DEFAULT_PANEL_KEY,
         auto_panel_enabled: bool = DEFAULT_AUTO_PANEL,
+        verbose: bool | None = None,
+        repeat_debounce: float = DEFAULT_REPEAT_DEBOUNCE,
     ) -> None:
         self.records: list[MacroRecord] = []
-        self._held_scancodes: set[int] = set()
+        # One global hook dispatches by scancode to (macro, is_numpad, meta) entries. On
+        # Windows that is our own low-level hook; elsewhere the keyboard library's.
+        self._hook: Callable | None = None
+        self._native_hook: NativeKeyHook | None = None
+        self._sc_to_macros: dict[int, tuple[tuple[Macro, bool, MacroMeta], ...]] = {}
+        # Only the hook thread (native or keyboard-library listener) reads and writes
+        # this, one event at a time, so the test-and-set in _handle_key needs no lock.
+        self._held_scancodes = bytearray(_SCANCODE_SPACE)
+        self._last_release_ns: dict[int, int] = {}
+        self._debounce_ns = int(repeat_debounce * 1_000_000_000)
+        # Flat prefilter for the keyboard-library path: nonzero for registered scancodes.
+        self._watched_scancodes = bytearray(_SCANCODE_SPACE)
         self._progress_callback = progress_callback
-        self._slot_hotkey_lookup: dict[str, str] = {}
+        # Per-trigger logging is dev-only by default; frozen release builds stay quiet.
+        self._verbose = not getattr(sys, "frozen", False) if verbose is None else verbose
+        # Macro is frozen, so resolved scancodes live in a sidecar map.
+        self._resolved_keys: dict[Macro, tuple[ResolvedKey | None, ...]] = {}
+        # (id(macro), panel_key) -> plan; dropped whenever macros or the panel key change.
+        self._sequence_cache: dict[tuple[int, str | None], MacroPlan] = {}
         self.auto_panel_key = auto_panel_key
         self.auto_panel_enabled = auto_panel_enabled
+        self._resolved_panel_key = self._resolve_panel_key(auto_panel_key)
+        self._panel_key_arg = self._panel_key_for(auto_panel_enabled, auto_panel_key)
+        # Held only for the busy test-and-set; macros themselves run lock-free.
         self._lock = threading.Lock()
+        self._busy = False
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._run_loop, name="macro-runner", daemon=True)
+        self._worker.start()
+        # Progress events are delivered off the hook/runner threads so a slow UI
+        # callback can't delay key handling.
+        self._progress_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._progress_thread = threading.Thread(
+            target=self._progress_loop, name="macro-progress", daemon=True
+        )
+        self._progress_thread.start()
+        self._timer_period_set = False
+        if sys.platform == "win32":
+            try:
+                import ctypes
+
+                # Ask for 1 ms timer resolution so sleeps don't round up to ~15.6 ms.
+                self._timer_period_set = ctypes.WinDLL("winmm").timeBeginPeriod(1) == 0
+            except Exception as exc:  # noqa: BLE001
+                log_lazy("Could not raise timer resolution: %s", exc)
 
     # -- Public config ----------------------------------------------------- #
     def set_auto_panel(self, enabled: bool, key: str) -> None:
         self.auto_panel_enabled = enabled
+        if key != self.auto_panel_key:
+            self._resolved_panel_key = self._resolve_panel_key(key)
+            self._sequence_cache.clear()
         self.auto_panel_key = key
+        self._panel_key_arg = self._panel_key_for(enabled, key)
 
     def set_progress_callback(self, callback: MacroProgressCallback | None) -> None:
         self._progress_callback = callback
@@ -45,105 +119,205 @@ class MacroManager:
     def register_macros(self, macros_by_slot: Dict[str, Macro]) -> None:
         """Clear existing listeners and register a fresh mapping."""
         self.clear()
-        self._slot_hotkey_lookup.clear()
+        # The slot is baked into each entry's meta, so triggers never look it up by name.
+        seen: set[str] = set()
         for slot, macro in macros_by_slot.items():
             hotkey = macro.hotkey.lower()
-            if hotkey in self._slot_hotkey_lookup:
-                log(f"Hotkey '{hotkey}' already in use; skipping {macro.name or slot}.")
+            if hotkey in seen:
+                log_lazy("Hotkey '%s' already in use; skipping %s.", hotkey, macro.name or slot)
                 continue
-            self._slot_hotkey_lookup[hotkey] = slot
-            self._add_macro(macro)
+            seen.add(hotkey)
+            self._add_macro(macro, (hotkey, slot, macro.name or macro.hotkey))
+        if self._sc_to_macros:
+            self._install_hook()
 
     def clear(self) -> None:
-        """Remove all listeners."""
-        for record in self.records:
-            press_hook, release_hook = record.handle
-            for hook in (press_hook, release_hook):
-                try:
-                    keyboard.unhook(hook)
-                except KeyError:
-                    # Hook already removed elsewhere; make clear idempotent.
-                    continue
-                except Exception as exc:  # noqa: BLE001
-                    log(f"Failed to unhook keyboard listener: {exc}")
+        """Remove the listener hook and forget all registered macros."""
+        native, self._native_hook = self._native_hook, None
+        if native is not None:
+            native.stop()
+        hook, self._hook = self._hook, None
+        if hook is not None:
+            try:
+                keyboard.unhook(hook)
+            except KeyError:
+                # Hook already removed elsewhere; make clear idempotent.
+                pass
+            except Exception as exc:  # noqa: BLE001
+                log_lazy("Failed to unhook keyboard listener: %s", exc)
         self.records.clear()
-        self._slot_hotkey_lookup.clear()
-        self._held_scancodes.clear()
+        self._sc_to_macros = {}
+        self._resolved_keys.clear()
+        self._sequence_cache.clear()
+        self._held_scancodes[:] = bytes(_SCANCODE_SPACE)
+        self._last_release_ns.clear()
+        self._watched_scancodes[:] = bytes(_SCANCODE_SPACE)
 
     def shutdown(self) -> None:
-        """Alias for clear for symmetry with startup."""
+        """Remove all listeners, stop the runner thread and restore the timer resolution."""
         self.clear()
+        if self._worker.is_alive():
+            self._jobs.put(None)
+            self._worker.join(timeout=1.0)
+        if self._progress_thread.is_alive():
+            self._progress_q.put(None)
+            self._progress_thread.join(timeout=1.0)
+        if self._timer_period_set:
+            try:
+                import ctypes
+
+                ctypes.WinDLL("winmm").timeEndPeriod(1)
+            except Exception:
+                pass
+            self._timer_period_set = False
 
     # -- Internals --------------------------------------------------------- #
-    def _add_macro(self, macro: Macro) -> None:
-        handle = self._register_macro(macro)
-        self.records.append(MacroRecord(macro, handle))
+    @staticmethod
+    def _resolve_panel_key(key: str) -> ResolvedKey | None:
+        key = (key or "").strip()
+        return resolve_key(key) if key else None
 
-    def _register_macro(self, macro: Macro) -> tuple[HotkeyHandle, HotkeyHandle]:
-        def on_press(event) -> None:
-            if event.event_type != "down":
+    @staticmethod
+    def _panel_key_for(enabled: bool, key: str) -> str | None:
+        if not enabled:
+            return None
+        return (key or "").strip() or None
+
+    def _build_plan(self, macro: Macro, panel_key: str | None) -> MacroPlan:
+        resolved = self._resolved_keys.get(macro)
+        if resolved is None:
+            resolved = tuple(resolve_key(key) for key in macro.keys)
+        sequence = (panel_key, *macro.keys) if panel_key else macro.keys
+        if panel_key:
+            resolved = (self._resolved_panel_key, *resolved)
+        total_time = len(sequence) * (macro.duration + macro.delay)
+        return (prepare_sequence(sequence, resolved), total_time)
+
+    def _add_macro(self, macro: Macro, meta: MacroMeta) -> None:
+        try:
+            scan_codes = tuple(keyboard.key_to_scan_codes(macro.hotkey))
+        except ValueError as exc:
+            log_lazy("Cannot listen for hotkey '%s': %s", macro.hotkey, exc)
+            return
+        self._resolved_keys[macro] = tuple(resolve_key(key) for key in macro.keys)
+        entry = (macro, macro.hotkey.startswith("num "), meta)
+        for sc in scan_codes:
+            self._sc_to_macros[sc] = self._sc_to_macros.get(sc, ()) + (entry,)
+            self._watched_scancodes[sc & 0xFFFF] = 1
+        self.records.append(MacroRecord(macro, scan_codes))
+
+    def _install_hook(self) -> None:
+        if IS_WINDOWS:
+            native = NativeKeyHook(self._on_native_key)
+            native.set_active(self._sc_to_macros)
+            try:
+                native.start()
+            except OSError as exc:
+                log_lazy("Native keyboard hook unavailable, using keyboard library: %s", exc)
+            else:
+                self._native_hook = native
                 return
-            if macro.hotkey.startswith("num "):
-                is_keypad = getattr(event, "is_keypad", None)
+        self._hook = keyboard.hook(self._on_event, suppress=False)
+
+    def _on_native_key(self, scan_code: int, is_down: bool, is_extended: bool) -> None:
+        # Numpad keys are never extended; the arrow cluster always is.
+        self._handle_key(scan_code, is_down, not is_extended, None)
+
+    def _on_event(self, event) -> None:  # noqa: ANN001
+        if not self._watched_scancodes[event.scan_code & 0xFFFF]:
+            return
+        try:
+            is_keypad = event.is_keypad
+        except AttributeError:
+            is_keypad = None
+        self._handle_key(event.scan_code, event.event_type is _KEY_DOWN, is_keypad, event.name)
+
+    def _handle_key(self, scan_code: int, is_down: bool, is_keypad: bool | None, name: str | None) -> None:
+        """Shared hook logic: one dict lookup, then the numpad/held filters."""
+        entries = self._sc_to_macros.get(scan_code)
+        if entries is None:
+            return
+        sc = scan_code & 0xFFFF
+        if not is_down:
+            self._held_scancodes[sc] = 0
+            self._last_release_ns[sc] = time.perf_counter_ns()
+            return
+        for macro, is_numpad, meta in entries:
+            if is_numpad:
                 if is_keypad is False:
-                    return
-                if is_keypad is None and event.name in ("up", "down", "left", "right"):
-                    return
-            sc = event.scan_code
-            if sc in self._held_scancodes:
+                    continue
+                if is_keypad is None and name in _ARROWS:
+                    continue
+            if self._held_scancodes[sc]:
                 return
-            self._held_scancodes.add(sc)
-            self._launch_macro(macro)
-
-        def on_release(event) -> None:
-            self._held_scancodes.discard(event.scan_code)
+            self._held_scancodes[sc] = 1
+            last_release = self._last_release_ns.get(sc)
+            if last_release is not None and time.perf_counter_ns() - last_release < self._debounce_ns:
+                return
+            self._launch_macro(macro, meta)
+            return
 
-        press_hook = keyboard.on_press_key(macro.hotkey, on_press, suppress=False)
-        release_hook = keyboard.on_release_key(macro.hotkey, on_release, suppress=False)
-        return (press_hook, release_hook)
+    def _launch_macro(self, macro: Macro, meta: MacroMeta) -> None:
+        hotkey_lower, slot, label = meta
+        with self._lock:
+            if self._busy:
+                log_lazy("Macro already running; ignoring '%s' (%s).", hotkey_lower, label)
+                return
+            self._busy = True
+        if self._verbose:
+            log_lazy("Trigger received for hotkey '%s' (%s).", hotkey_lower, label)
+        try:
+            panel_key_arg = self._panel_key_arg
+            cache_key = (id(macro), panel_key_arg)
+            plan = self._sequence_cache.get(cache_key)
+            if plan is None:
+                plan = self._build_plan(macro, panel_key_arg)
+                self._sequence_cache[cache_key] = plan
+            steps, total_time = plan
+            self._notify_progress("start", macro, slot, total_time)
+            self._jobs.put_nowait((macro, steps, panel_key_arg, slot))
+        except Exception as exc:  # noqa: BLE001
+            # The runner never saw this job, so its finally won't clear busy.
+            self._busy = False
+            log_lazy("Macro failed to start (%s): %s", label, exc)
 
-    def _launch_macro(self, macro: Macro) -> None:
-        label = macro.name or macro.hotkey
-        log(f"Trigger received for hotkey '{macro.hotkey}' ({label}).")
-        slot = self._slot_hotkey_lookup.get(macro.hotkey.lower())
-        panel_key_arg = None
-        if self.auto_panel_enabled:
-            key = (self.auto_panel_key or "").strip()
-            if key:
-                panel_key_arg = str(key)
-
-        total_len = len(macro.keys) + (1 if panel_key_arg else 0)
-        total_time = total_len * (macro.duration + macro.delay)
-        self._notify_progress("start", macro, slot, total_time)
-
-        def _worker() -> None:
+    def _run_loop(self) -> None:
+        """Persistent runner thread: play queued macros until a None sentinel arrives."""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            macro, steps, panel_key, slot = job
             try:
-                self._run_macro(macro, panel_key_arg)
+                self._run_macro(macro, steps, panel_key)
+            except Exception as exc:  # noqa: BLE001
+                log_lazy("Macro failed: %s", exc)
             finally:
+                self._busy = False
                 self._notify_progress("stop", macro, slot, None)
 
-        threading.Thread(target=_worker, daemon=True).start()
-
-    def _run_macro(self, macro: Macro, panel_key: str | None) -> None:
-        with self._lock:
-            label = macro.name or macro.hotkey
-            sequence: Iterable[str] = (panel_key, *macro.keys) if panel_key else tuple(macro.keys)
-            if panel_key:
-                log(f"{label}: auto panel ON, prepending '{panel_key}'.")
-            seq_tuple = tuple(sequence)
-            log(f"{label}: running {len(seq_tuple)} key presses...")
-            for key in seq_tuple:
-                keyboard.press(key)
-                time.sleep(macro.duration)
-                keyboard.release(key)
-                time.sleep(macro.delay)
-            log(f"{label}: done.")
+    def _run_macro(self, macro: Macro, steps: tuple[PreparedKey, ...], panel_key: str | None) -> None:
+        label = macro.name or macro.hotkey
+        if panel_key:
+            log_lazy("%s: auto panel ON, prepending '%s'.", label, panel_key)
+        log_lazy("%s: running %d key presses...", label, len(steps))
+        run_prepared(steps, macro.duration, macro.delay)
+        log_lazy("%s: done.", label)
 
     def _notify_progress(self, event: str, macro: Macro, slot: str | None, total_time: float | None) -> None:
-        cb = self._progress_callback
-        if cb is None:
+        if self._progress_callback is None:
             return
-        try:
-            cb(event, macro, slot, total_time)
-        except Exception:
-            pass
+        self._progress_q.put_nowait((event, macro, slot, total_time))
+
+    def _progress_loop(self) -> None:
+        while True:
+            item = self._progress_q.get()
+            if item is None:
+                return
+            cb = self._progress_callback
+            if cb is None:
+                continue
+            try:
+                cb(*item)
+            except Exception:
+                pass
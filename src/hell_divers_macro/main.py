@@ -10,8 +10,9 @@ The UI pieces are split into small helpers:
 from __future__ import annotations
 
 import json
+import queue
 import sys
-import threading
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict
 
@@ -25,10 +26,12 @@ if __package__ in (None, ""):
     sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from hell_divers_macro.config import (  # noqa: E402
-    DEFAULT_AUTO_PANEL,
-    DEFAULT_OVERLAY_OPACITY,
+    DIRECTION_NAMES,
     EXIT_HOTKEY,
-    NUMPAD_SLOTS,
+    LAST_PROFILE_LOAD_DELAY_MS,
+    LOG_DRAIN_MS,
+    MAX_LOG_LINES,
+    NUMPAD_SLOT_NAMES,
 )
 from hell_divers_macro.log_utils import clear_log_callback, log, set_log_callback  # noqa: E402
 from hell_divers_macro.macro_manager import MacroManager  # noqa: E402
@@ -44,7 +47,7 @@ from hell_divers_macro.ui.dialogs import MacroSelectionDialog  # noqa: E402
 from hell_divers_macro.ui.icons import (  # noqa: E402
     APP_ICON_PATH,
     OVERLAY_ALPHA,
-    load_icon_image,
+    request_icon_image,
 )
 from hell_divers_macro.ui.overlay import OverlayWindow  # noqa: E402
 from hell_divers_macro.ui.theme import (  # noqa: E402
@@ -56,11 +59,27 @@ from hell_divers_macro.ui.theme import (  # noqa: E402
     MENU_BG,
     apply_dark_theme,
     init_base_theme,
+    keep_own_colors,
     place_window_near,
     set_dark_titlebar,
 )
 
 
+# Option-database defaults for the File/Edit/Help bar buttons, scoped to the
+# menu bar frame by its widget name so other buttons are unaffected.
+_MENU_BAR_NAME = "menubar"
+_MENU_BUTTON_OPTIONS = (
+    ("background", MENU_BG),
+    ("foreground", FG),
+    ("activeBackground", BUTTON_ACTIVE),
+    ("activeForeground", FG),
+    ("relief", tk.FLAT),
+    ("borderWidth", 0),
+    ("highlightThickness", 0),
+)
+
+
+@lru_cache(maxsize=256)
 def _display_hotkey_text(raw: str, default: str) -> str:
     if not raw:
         return default
@@ -83,7 +102,9 @@ class MacroApp:
         ensure_saves_dir()
         self.templates: tuple[MacroTemplate, ...] = load_stratagem_templates()
         self.last_profile_marker = ensure_saves_dir() / ".last_profile"
-        self.saved_state = self.state.serialize()
+        # Path text last written to (or read from) the marker, to skip no-op rewrites.
+        self._recorded_profile: str | None = None
+        self.saved_fingerprint = self.state.fingerprint()
 
         self.root = tk.Tk()
         self.root.title("HELLDIVERS2 Stratagem Macro")
@@ -99,6 +120,8 @@ class MacroApp:
 
         self.slot_buttons: dict[str, tk.Button] = {}
         self.slot_icons: dict[str, ImageTk.PhotoImage | None] = {}
+        self._buttons_update_job: str | None = None
+        self._closing = False
         self.status_var = tk.StringVar(value="Not listening. Assign macros, then start listening.")
         self.auto_panel_var = tk.BooleanVar(value=self.state.auto_panel)
         self.panel_key_display = tk.StringVar(value="")
@@ -107,6 +130,7 @@ class MacroApp:
         self.exit_handle: int | None = None
         self.listening = False
         self.log_list: tk.Listbox | None = None
+        self._log_queue: queue.SimpleQueue[str] = queue.SimpleQueue()
 
         self.manager = MacroManager(
             progress_callback=None,
@@ -125,16 +149,20 @@ class MacroApp:
         self.manager.set_progress_callback(self.overlay.handle_macro_progress)
 
         self._build_ui()
-        self._refresh_menu_bar_colors()
-        apply_dark_theme(self.root)
-        set_dark_titlebar(self.root)
+        # Theming runs in the same idle pass as the first slot-grid refresh, once
+        # every widget exists, instead of configuring the tree while it is built.
+        self.root.after_idle(self._apply_startup_theme)
         self._refresh_panel_display()
         self._sync_auto_panel_state()
         self._register_overlay_lock_hotkey()
         self._register_exit_hotkey()
-        self._load_last_profile()
+        # Load after the first paint so a slow disk or large profile can't hold the window back.
+        self.root.after(LAST_PROFILE_LOAD_DELAY_MS, self._load_last_profile)
         self.root.protocol("WM_DELETE_WINDOW", self._attempt_exit)
-        self.root.bind("<<RequestExit>>", lambda _: self._attempt_exit())
+
+    def _apply_startup_theme(self) -> None:
+        apply_dark_theme(self.root)
+        set_dark_titlebar(self.root)
 
     # -- UI construction -------------------------------------------------- #
     def _build_ui(self) -> None:
@@ -146,7 +174,12 @@ class MacroApp:
         self.root.bind("<Configure>", lambda event=None: self._on_root_configure())
 
     def _build_menu_bar(self) -> None:
-        self.menu_bar = tk.Frame(self.root, bg=MENU_BG, bd=0, highlightthickness=0)
+        for option, value in _MENU_BUTTON_OPTIONS:
+            self.root.option_add(f"*{_MENU_BAR_NAME}.Button.{option}", value)
+        self.menu_bar = tk.Frame(self.root, name=_MENU_BAR_NAME, bg=MENU_BG, bd=0, highlightthickness=0)
+        # Its buttons are styled by the option entries above, not the generic Button palette.
+        keep_own_colors(self.menu_bar)
+        self._menu_anchors: dict[tk.Menu, tk.Button] = {}
         self.menu_bar.pack(fill=tk.X, side=tk.TOP)
 
         file_menu = tk.Menu(
@@ -161,10 +194,10 @@ class MacroApp:
         )
         file_menu.add_command(label="Save Profile", command=self._save_profile_action)
         file_menu.add_command(label="Load Profile", command=self._load_profile_action)
-        file_menu.add_command(label="New", command=lambda: self._load_blank_profile(show_messages=True))
+        file_menu.add_command(label="New", command=partial(self._load_blank_profile, show_messages=True))
         file_menu.add_command(label="Settings", command=self._open_settings)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=lambda: self.root.event_generate("<<RequestExit>>"))
+        file_menu.add_command(label="Exit", command=self._attempt_exit)
 
         edit_menu = tk.Menu(
             self.root,
@@ -195,21 +228,11 @@ class MacroApp:
         self._add_menu_button("Help", help_menu)
 
     def _add_menu_button(self, label: str, menu: tk.Menu) -> None:
-        btn = tk.Button(
-            self.menu_bar,
-            text=label,
-            bg=MENU_BG,
-            fg=FG,
-            relief=tk.FLAT,
-            bd=0,
-            padx=10,
-            pady=6,
-            highlightthickness=0,
-            activebackground=BUTTON_ACTIVE,
-            activeforeground=FG,
-        )
-        btn.config(command=lambda b=btn, m=menu: self._popup_menu(m, b))
+        # The command finds its anchor button through _menu_anchors, so it can be
+        # passed to the constructor instead of configured afterwards.
+        btn = tk.Button(self.menu_bar, text=label, padx=10, pady=6, command=partial(self._popup_menu, menu))
         btn.pack(side=tk.LEFT)
+        self._menu_anchors[menu] = btn
 
     def _build_auto_panel_row(self) -> None:
         self.auto_panel_frame = tk.Frame(self.root, bg=BG)
@@ -243,7 +266,7 @@ class MacroApp:
                 btn = tk.Button(
                     cell,
                     text=f"{slot}\nUnassigned",
-                    command=lambda s=slot: self._choose_macro_for_slot(s),
+                    command=partial(self._choose_macro_for_slot, slot),
                 )
                 btn.pack(fill=tk.BOTH, expand=True)
                 grid_frame.grid_columnconfigure(c, weight=1, uniform="slots")
@@ -271,21 +294,54 @@ class MacroApp:
         self.log_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         log_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
-        def ui_log(message: str) -> None:
-            print(message)
-            if self.log_list is None:
-                return
-            self.log_list.insert(tk.END, message)
-            self.log_list.yview_moveto(1)
+        # Log calls come from the hook and runner threads; they only enqueue, and
+        # a single periodic drain on the Tk thread applies them in batches.
+        set_log_callback(self._log_queue.put_nowait)
+        self.root.after(LOG_DRAIN_MS, self._drain_log_queue)
 
-        set_log_callback(lambda msg: self.root.after(0, lambda m=msg: ui_log(m)))
+    def _take_log_lines(self) -> list[str]:
+        lines: list[str] = []
+        try:
+            while True:
+                lines.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return lines
+
+    def _drain_log_queue(self) -> None:
+        if self._closing:
+            return
+        lines = self._take_log_lines()
+        if lines:
+            self._write_stdout_log(lines)
+            if self.log_list is not None:
+                self.log_list.insert(tk.END, *lines)
+                overflow = self.log_list.size() - MAX_LOG_LINES
+                if overflow > 0:
+                    self.log_list.delete(0, overflow - 1)
+                self.log_list.yview_moveto(1)
+        self.root.after(LOG_DRAIN_MS, self._drain_log_queue)
+
+    @staticmethod
+    def _write_stdout_log(lines: list[str]) -> None:
+        """Echo a batch of log lines to stdout in one write."""
+        if sys.stdout is None:
+            return
+        try:
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
 
     # -- State helpers ---------------------------------------------------- #
     def _serialize_state(self) -> dict:
         return self.state.serialize()
 
+    def _mark_saved(self) -> None:
+        self.saved_fingerprint = self.state.fingerprint()
+
     def _has_unsaved_changes(self) -> bool:
-        return self._serialize_state() != self.saved_state
+        return self.state.fingerprint() != self.saved_fingerprint
 
     def _refresh_panel_display(self) -> None:
         display_text = _display_hotkey_text(self.state.panel_key, self.state.panel_key or "Unset")
@@ -301,16 +357,45 @@ class MacroApp:
         hotkey_text = _display_hotkey_text(hotkey, slot)
         icon: ImageTk.PhotoImage | None = None
         if tpl:
-            icon = load_icon_image(tpl.name, hotkey_text)
+            icon = request_icon_image(
+                self.root,
+                tpl.name,
+                hotkey_text,
+                lambda photo, s=slot, n=tpl.name, h=hotkey_text: self._on_slot_icon_ready(s, n, h, photo),
+            )
+        self._set_slot_icon(slot, icon, tpl.name if tpl else "Unassigned", hotkey_text)
+        self.overlay.update_slot(slot, tpl, hotkey)
+
+    def _set_slot_icon(
+        self, slot: str, icon: ImageTk.PhotoImage | None, name: str, hotkey_text: str
+    ) -> None:
         self.slot_icons[slot] = icon
         if icon:
             self.slot_buttons[slot].config(image=icon, text="", compound=tk.CENTER)
         else:
-            name = tpl.name if tpl else "Unassigned"
             self.slot_buttons[slot].config(text=f"{hotkey_text}\n{name}", image="", compound=tk.NONE)
-        self.overlay.update_slot(slot, tpl, hotkey)
+
+    def _on_slot_icon_ready(self, slot: str, name: str, hotkey_text: str, icon: ImageTk.PhotoImage) -> None:
+        """Swap in a background-rendered icon unless the slot changed meanwhile."""
+        tpl = self.state.assignments.get(slot)
+        hotkey = self.state.slot_hotkeys.get(slot, slot)
+        if tpl is None or tpl.name != name or _display_hotkey_text(hotkey, slot) != hotkey_text:
+            return
+        self._set_slot_icon(slot, icon, name, hotkey_text)
 
     def _update_all_buttons(self) -> None:
+        """Refresh every slot once the current event finishes.
+
+        Callers often change several settings in a row; coalescing into one idle
+        pass means the grid is reconfigured and laid out once, not per call.
+        """
+        if self._closing:
+            return
+        if self._buttons_update_job is None:
+            self._buttons_update_job = self.root.after_idle(self._flush_button_updates)
+
+    def _flush_button_updates(self) -> None:
+        self._buttons_update_job = None
         for slot in self.state.assignments:
             self._update_slot_button(slot)
 
@@ -319,7 +404,7 @@ class MacroApp:
         if not self.listening:
             return
         macros: Dict[str, Macro] = {}
-        for slot, _ in NUMPAD_SLOTS:
+        for slot in NUMPAD_SLOT_NAMES:
             tpl = self.state.assignments.get(slot)
             hotkey = self.state.slot_hotkeys.get(slot)
             if tpl is None or not hotkey:
@@ -376,11 +461,12 @@ class MacroApp:
     def _save_profile_to_path(self, path: Path, show_message: bool = True) -> bool:
         data = self._serialize_state()
         try:
-            with path.open("w", encoding="utf-8") as fh:
-                json.dump(data, fh, indent=2)
+            # Encode up front and write once; json.dump streams many tiny writes.
+            path.write_text(json.dumps(data, indent=2), encoding="utf-8")
         except OSError as exc:
             messagebox.showerror("Cannot save profile", str(exc))
             return False
+        self._mark_saved()
         if show_message:
             messagebox.showinfo("Profile saved", f"Saved to {path.name}.")
         self._record_last_profile(path)
@@ -398,29 +484,30 @@ class MacroApp:
         if not path_str:
             return
         path = Path(path_str)
-        if self._save_profile_to_path(path):
-            self.saved_state = self._serialize_state()
+        self._save_profile_to_path(path)
 
-    def _load_profile_from_path(self, path: Path, show_messages: bool = True) -> bool:
-        try:
-            with path.open("r", encoding="utf-8") as fh:
-                content = json.load(fh)
-        except (OSError, json.JSONDecodeError) as exc:
-            if show_messages:
-                messagebox.showerror("Cannot load profile", f"Failed to read file: {exc}")
-            return False
-        missing = self.state.apply_profile(content, self.templates)
+    def _apply_loaded_state(self) -> None:
+        """Push a freshly loaded or reset state into the UI, overlay and listeners in one pass."""
         self.auto_panel_var.set(self.state.auto_panel)
         self.overlay_opacity_var.set(_clamp_opacity(self.state.overlay_opacity))
         self.overlay.set_lock_key(self.state.overlay_lock_key)
         self.overlay.set_locked(False)
-        self.manager.set_auto_panel(self.state.auto_panel, self.state.panel_key)
-        self._sync_auto_panel_state()
         self._register_overlay_lock_hotkey()
         self._refresh_panel_display()
+        self._sync_auto_panel_state()
         self._update_all_buttons()
         if self.listening:
             self._rebuild_listeners()
+
+    def _load_profile_from_path(self, path: Path, show_messages: bool = True) -> bool:
+        try:
+            content = json.loads(path.read_bytes())
+        except (OSError, json.JSONDecodeError) as exc:
+            if show_messages:
+                messagebox.showerror("Cannot load profile", f"Failed to read file: {exc}")
+            return False
+        missing = self.state.apply_profile(content, self.templates)
+        self._apply_loaded_state()
         if show_messages:
             if missing:
                 messagebox.showwarning(
@@ -429,7 +516,7 @@ class MacroApp:
                 )
             else:
                 messagebox.showinfo("Profile loaded", f"Loaded {path}.")
-        self.saved_state = self._serialize_state()
+        self._mark_saved()
         self._record_last_profile(path)
         return True
 
@@ -446,18 +533,10 @@ class MacroApp:
 
     def _load_blank_profile(self, show_messages: bool = True) -> None:
         self.state.reset()
-        self.auto_panel_var.set(DEFAULT_AUTO_PANEL)
-        self.overlay_opacity_var.set(DEFAULT_OVERLAY_OPACITY)
-        self.overlay.set_lock_key(self.state.overlay_lock_key)
-        self.overlay.set_locked(False)
-        self._register_overlay_lock_hotkey()
-        self._refresh_panel_display()
-        self._sync_auto_panel_state()
-        self._update_all_buttons()
-        if self.listening:
-            self._rebuild_listeners()
-        self.saved_state = self._serialize_state()
+        self._apply_loaded_state()
+        self._mark_saved()
         try:
+            self._recorded_profile = None
             if self.last_profile_marker.exists():
                 self.last_profile_marker.unlink()
         except OSError:
@@ -507,27 +586,43 @@ class MacroApp:
 
         current_category = {"val": None}
 
+        # One bit per category whose pending value differs from the live state.
+        # Each bit is recomputed only when its category is edited, so tab switches
+        # don't re-diff every mapping.
+        DIRTY_SLOTS, DIRTY_DIRECTIONS, DIRTY_PANEL, DIRTY_LOCK, DIRTY_TIMING = 1, 2, 4, 8, 16
+        dirty = {"mask": 0}
+
+        def mark_dirty(bit: int, changed: bool) -> None:
+            if changed:
+                dirty["mask"] |= bit
+            else:
+                dirty["mask"] &= ~bit
+
         def is_dirty() -> bool:
-            return (
-                pending_hotkeys != self.state.slot_hotkeys
-                or pending_direction_keys != self.state.direction_keys
-                or active_values["delay"] != self.state.macro_delay
-                or active_values["duration"] != self.state.macro_duration
-                or pending_panel_key != self.state.panel_key
-                or pending_overlay_lock_key != self.state.overlay_lock_key
-                or abs(_clamp_opacity(pending_overlay_opacity.get()) - _clamp_opacity(self.overlay_opacity_var.get()))
+            # Opacity stays a live compare: the overlay can change the shared var too.
+            return bool(dirty["mask"]) or (
+                abs(_clamp_opacity(pending_overlay_opacity.get()) - _clamp_opacity(self.overlay_opacity_var.get()))
                 > 1e-4
             )
 
+        # Text each key label was last given, so refreshes only touch labels that changed.
+        shown_label_text: dict[tk.Label, str] = {}
+
+        def _set_label_text(label: tk.Label, text: str) -> None:
+            if shown_label_text.get(label) != text:
+                label.config(text=text)
+                shown_label_text[label] = text
+
         def refresh_labels() -> None:
+            if not settings.winfo_exists():
+                return
             for slot, label in hotkey_labels.items():
-                label.config(text=_display_hotkey_text(pending_hotkeys.get(slot, ""), slot))
+                _set_label_text(label, _display_hotkey_text(pending_hotkeys.get(slot, ""), slot))
             for direction, label in dir_labels.items():
-                label.config(text=pending_direction_keys.get(direction, ""))
+                _set_label_text(label, pending_direction_keys.get(direction, ""))
             panel_key_label_var.set(_display_hotkey_text(pending_panel_key, pending_panel_key))
             overlay_lock_label_var.set(_display_hotkey_text(pending_overlay_lock_key, pending_overlay_lock_key))
             overlay_opacity_label_var.set(f"{int(_clamp_opacity(pending_overlay_opacity.get()) * 100)}%")
-            settings.update_idletasks()
 
         def _all_capture_buttons() -> list[tk.Button]:
             buttons: list[tk.Button] = list(change_buttons.values()) + list(dir_buttons.values())
@@ -542,20 +637,29 @@ class MacroApp:
         ) -> None:
             nonlocal pending_panel_key, pending_overlay_lock_key
             capturing["active"] = False
+            if not settings.winfo_exists():
+                # Dialog closed mid-capture: nothing to update, but listening resumes.
+                if was_listening:
+                    self._rebuild_listeners()
+                return
             for btn in _all_capture_buttons():
                 btn.config(state=tk.NORMAL)
             if new_key:
                 if kind == "slot":
                     pending_hotkeys[target] = new_key
+                    mark_dirty(DIRTY_SLOTS, pending_hotkeys != self.state.slot_hotkeys)
                     status_local.set(f"Numpad {target} pending bind to '{new_key}'. Click Apply to confirm.")
                 elif kind == "direction":
                     pending_direction_keys[target] = new_key
+                    mark_dirty(DIRTY_DIRECTIONS, pending_direction_keys != self.state.direction_keys)
                     status_local.set(f"{target} pending bind to '{new_key}'. Click Apply to confirm.")
                 elif kind == "panel":
                     pending_panel_key = new_key
+                    mark_dirty(DIRTY_PANEL, pending_panel_key != self.state.panel_key)
                     status_local.set(f"Stratagem Panel pending bind to '{new_key}'. Click Apply to confirm.")
                 else:
                     pending_overlay_lock_key = new_key
+                    mark_dirty(DIRTY_LOCK, pending_overlay_lock_key != self.state.overlay_lock_key)
                     status_local.set(f"Overlay lock toggle pending bind to '{new_key}'. Click Apply to confirm.")
                 refresh_labels()
             elif error:
@@ -566,6 +670,27 @@ class MacroApp:
             if was_listening:
                 self._rebuild_listeners()
 
+        # Keyboard hook for the capture in progress; None while idle.
+        capture_hook: dict[str, object] = {"handle": None, "was_listening": False}
+
+        def stop_capture_hook() -> bool:
+            handle = capture_hook["handle"]
+            if handle is None:
+                return False
+            capture_hook["handle"] = None
+            try:
+                keyboard.unhook(handle)
+            except (KeyError, ValueError):
+                pass
+            return True
+
+        def on_settings_destroy(event: tk.Event) -> None:
+            # Closing mid-capture must not leave the hook behind or listeners off.
+            if event.widget is settings and stop_capture_hook() and capture_hook["was_listening"]:
+                self._rebuild_listeners()
+
+        settings.bind("<Destroy>", on_settings_destroy, add="+")
+
         def start_capture(target: str, kind: str) -> None:
             if capturing["active"]:
                 return
@@ -583,17 +708,26 @@ class MacroApp:
             for btn in _all_capture_buttons():
                 btn.config(state=tk.DISABLED)
 
-            def worker() -> None:
+            def deliver(key: str) -> None:
+                # Unhook on the Tk thread; removing a handler from inside the
+                # keyboard listener's dispatch loop is not safe.
+                if stop_capture_hook():
+                    finish_capture(target, key, None, was_listening, kind)
+
+            def on_key(event) -> None:  # noqa: ANN001
+                if event.event_type != keyboard.KEY_DOWN or not event.name:
+                    return
+                key = event.name.lower()
                 try:
-                    key = keyboard.read_key(suppress=False)
-                    key = key.lower()
-                    settings.after(0, lambda: finish_capture(target, key, None, was_listening, kind))
-                except Exception as exc:  # noqa: BLE001
-                    settings.after(
-                        0, lambda: finish_capture(target, None, f"Capture failed: {exc}", was_listening, kind)
-                    )
+                    settings.after(0, lambda: deliver(key))
+                except (RuntimeError, tk.TclError):
+                    pass
 
-            threading.Thread(target=worker, daemon=True).start()
+            try:
+                capture_hook["handle"] = keyboard.hook(on_key, suppress=False)
+                capture_hook["was_listening"] = was_listening
+            except Exception as exc:  # noqa: BLE001
+                finish_capture(target, None, f"Capture failed: {exc}", was_listening, kind)
 
         def apply_and_stay() -> None:
             nonlocal pending_panel_key, pending_overlay_lock_key
@@ -614,6 +748,7 @@ class MacroApp:
             self._update_all_buttons()
             if self.listening:
                 self._rebuild_listeners()
+            dirty["mask"] = 0
             status_local.set("Applied bindings and overlay settings.")
 
         def reset_pending_from_live() -> None:
@@ -627,6 +762,7 @@ class MacroApp:
             pending_overlay_opacity.set(_clamp_opacity(self.overlay_opacity_var.get()))
             active_values["delay"] = self.state.macro_delay
             active_values["duration"] = self.state.macro_duration
+            dirty["mask"] = 0
             refresh_labels()
 
         def switch_category(target: str) -> None:
@@ -637,138 +773,170 @@ class MacroApp:
                     apply_and_stay()
                 else:
                     reset_pending_from_live()
-            for frame in (slot_section, dir_section, delay_section, panel_section, overlay_section):
-                frame.pack_forget()
-            for btn in (slot_btn, dir_btn, panel_btn, delay_btn, overlay_btn):
-                btn.config(relief=tk.RAISED)
-            if target == "slot":
-                slot_section.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
-                slot_btn.config(relief=tk.SUNKEN)
-            elif target == "direction":
-                dir_section.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
-                dir_btn.config(relief=tk.SUNKEN)
-            elif target == "panel":
-                panel_section.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
-                panel_btn.config(relief=tk.SUNKEN)
-            elif target == "overlay":
-                overlay_section.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
-                overlay_btn.config(relief=tk.SUNKEN)
-            else:
-                delay_section.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
-                delay_btn.config(relief=tk.SUNKEN)
+            ensure_section_built(target)
+            previous = current_category["val"]
+            if previous is not None:
+                section_builders[previous][0].pack_forget()
+                tab_buttons[previous].config(relief=tk.RAISED)
+            section_builders[target][0].pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+            tab_buttons[target].config(relief=tk.SUNKEN)
             current_category["val"] = target
             settings.update_idletasks()
 
-        slot_btn = tk.Button(tabs_frame, text="Slot Hotkeys", command=lambda: switch_category("slot"))
-        dir_btn = tk.Button(tabs_frame, text="Direction Keys", command=lambda: switch_category("direction"))
-        panel_btn = tk.Button(tabs_frame, text="Panel Key", command=lambda: switch_category("panel"))
-        delay_btn = tk.Button(tabs_frame, text="Macro Delay", command=lambda: switch_category("delay"))
+        slot_btn = tk.Button(tabs_frame, text="Slot Hotkeys", command=partial(switch_category, "slot"))
+        dir_btn = tk.Button(tabs_frame, text="Direction Keys", command=partial(switch_category, "direction"))
+        panel_btn = tk.Button(tabs_frame, text="Panel Key", command=partial(switch_category, "panel"))
+        delay_btn = tk.Button(tabs_frame, text="Macro Delay", command=partial(switch_category, "delay"))
         slot_btn.pack(side=tk.LEFT, padx=(0, 6))
         dir_btn.pack(side=tk.LEFT)
         panel_btn.pack(side=tk.LEFT, padx=(6, 6))
         delay_btn.pack(side=tk.LEFT)
-        overlay_btn = tk.Button(tabs_frame, text="Overlay", command=lambda: switch_category("overlay"))
+        overlay_btn = tk.Button(tabs_frame, text="Overlay", command=partial(switch_category, "overlay"))
         overlay_btn.pack(side=tk.LEFT, padx=(6, 0))
+        tab_buttons = {
+            "slot": slot_btn,
+            "direction": dir_btn,
+            "panel": panel_btn,
+            "delay": delay_btn,
+            "overlay": overlay_btn,
+        }
+
+        def add_capture_row(
+            section: tk.Frame, index: int, title: str, key_text: str, target: str, kind: str
+        ) -> tuple[tk.Label, tk.Button]:
+            # Rows are gridded straight into the section (no per-row frame), so the
+            # whole list is laid out in one grid pass instead of a pack per row.
+            tk.Label(section, text=title, width=12, anchor="w").grid(row=index, column=0, sticky="w", pady=2)
+            label = tk.Label(section, text=key_text, width=12, anchor="w")
+            label.grid(row=index, column=1, sticky="w", padx=(0, 6), pady=2)
+            button = tk.Button(section, text="Change", command=partial(start_capture, target, kind))
+            button.grid(row=index, column=2, sticky="w", pady=2)
+            return label, button
+
+        def build_slot_section() -> None:
+            for index, slot in enumerate(NUMPAD_SLOT_NAMES):
+                hotkey_labels[slot], change_buttons[slot] = add_capture_row(
+                    slot_section,
+                    index,
+                    f"Numpad {slot}",
+                    _display_hotkey_text(pending_hotkeys.get(slot, ""), slot),
+                    slot,
+                    "slot",
+                )
 
-        for slot, _ in NUMPAD_SLOTS:
-            row = tk.Frame(slot_section, bg=BG)
-            row.pack(fill=tk.X, pady=2)
-            tk.Label(row, text=f"Numpad {slot}", width=12, anchor="w").pack(side=tk.LEFT)
-            hotkey_labels[slot] = tk.Label(
-                row, text=_display_hotkey_text(pending_hotkeys.get(slot, ""), slot), width=12, anchor="w"
-            )
-            hotkey_labels[slot].pack(side=tk.LEFT, padx=(0, 6))
-            btn = tk.Button(row, text="Change", command=lambda s=slot: start_capture(s, "slot"))
-            btn.pack(side=tk.LEFT)
-            change_buttons[slot] = btn
-
-        for direction in ("Up", "Down", "Left", "Right"):
-            row = tk.Frame(dir_section, bg=BG)
-            row.pack(fill=tk.X, pady=2)
-            tk.Label(row, text=direction, width=12, anchor="w").pack(side=tk.LEFT)
-            dir_labels[direction] = tk.Label(row, text=pending_direction_keys.get(direction, ""), width=12, anchor="w")
-            dir_labels[direction].pack(side=tk.LEFT, padx=(0, 6))
-            btn = tk.Button(row, text="Change", command=lambda d=direction: start_capture(d, "direction"))
-            btn.pack(side=tk.LEFT)
-            dir_buttons[direction] = btn
-
-        row = tk.Frame(panel_section, bg=BG)
-        row.pack(fill=tk.X, pady=4)
-        tk.Label(row, text="Stratagem Panel", width=16, anchor="w").pack(side=tk.LEFT)
-        panel_label = tk.Label(row, textvariable=panel_key_label_var, width=12, anchor="w")
-        panel_label.pack(side=tk.LEFT, padx=(0, 6))
-        panel_change_btn = tk.Button(row, text="Change", command=lambda: start_capture("panel", "panel"))
-        panel_change_btn.pack(side=tk.LEFT)
-
-        row_overlay = tk.Frame(overlay_section, bg=BG)
-        row_overlay.pack(fill=tk.X, pady=4)
-        tk.Label(row_overlay, text="Overlay Lock Key", width=18, anchor="w").pack(side=tk.LEFT)
-        tk.Label(row_overlay, textvariable=overlay_lock_label_var, width=12, anchor="w").pack(
-            side=tk.LEFT, padx=(0, 6)
-        )
-        overlay_lock_btn = tk.Button(
-            row_overlay, text="Change", command=lambda: start_capture("overlay_lock", "overlay_lock")
-        )
-        overlay_lock_btn.pack(side=tk.LEFT)
-
-        tk.Label(overlay_section, text="Overlay Opacity", anchor="w").pack(fill=tk.X, pady=(12, 4))
-        op_row = tk.Frame(overlay_section, bg=BG)
-        op_row.pack(fill=tk.X, pady=(0, 8))
-        opacity_scale = tk.Scale(
-            op_row,
-            from_=0.3,
-            to=1.0,
-            resolution=0.01,
-            orient=tk.HORIZONTAL,
-            showvalue=False,
-            length=200,
-            bg=BG,
-            fg=FG,
-            troughcolor=BUTTON_BG,
-            highlightthickness=0,
-            command=lambda v: None,
-        )
-        opacity_scale.set(pending_overlay_opacity.get())
-        opacity_scale.pack(side=tk.LEFT, padx=(0, 8))
-        tk.Label(op_row, textvariable=overlay_opacity_label_var, width=6, anchor="w").pack(side=tk.LEFT)
-
-        def on_overlay_opacity_change(val: str) -> None:
-            pending_overlay_opacity.set(_clamp_opacity(float(val)))
-            overlay_opacity_label_var.set(f"{int(_clamp_opacity(float(val)) * 100)}%")
+        def build_direction_section() -> None:
+            for index, direction in enumerate(DIRECTION_NAMES):
+                dir_labels[direction], dir_buttons[direction] = add_capture_row(
+                    dir_section, index, direction, pending_direction_keys.get(direction, ""), direction, "direction"
+                )
 
-        opacity_scale.config(command=on_overlay_opacity_change)
+        def build_panel_section() -> None:
+            nonlocal panel_change_btn
+            row = tk.Frame(panel_section, bg=BG)
+            row.pack(fill=tk.X, pady=4)
+            tk.Label(row, text="Stratagem Panel", width=16, anchor="w").pack(side=tk.LEFT)
+            panel_label = tk.Label(row, textvariable=panel_key_label_var, width=12, anchor="w")
+            panel_label.pack(side=tk.LEFT, padx=(0, 6))
+            panel_change_btn = tk.Button(row, text="Change", command=partial(start_capture, "panel", "panel"))
+            panel_change_btn.pack(side=tk.LEFT)
+
+        def build_overlay_section() -> None:
+            nonlocal overlay_lock_btn
+            row_overlay = tk.Frame(overlay_section, bg=BG)
+            row_overlay.pack(fill=tk.X, pady=4)
+            tk.Label(row_overlay, text="Overlay Lock Key", width=18, anchor="w").pack(side=tk.LEFT)
+            tk.Label(row_overlay, textvariable=overlay_lock_label_var, width=12, anchor="w").pack(
+                side=tk.LEFT, padx=(0, 6)
+            )
+            overlay_lock_btn = tk.Button(
+                row_overlay, text="Change", command=partial(start_capture, "overlay_lock", "overlay_lock")
+            )
+            overlay_lock_btn.pack(side=tk.LEFT)
+
+            tk.Label(overlay_section, text="Overlay Opacity", anchor="w").pack(fill=tk.X, pady=(12, 4))
+            op_row = tk.Frame(overlay_section, bg=BG)
+            op_row.pack(fill=tk.X, pady=(0, 8))
+            opacity_scale = tk.Scale(
+                op_row,
+                from_=0.3,
+                to=1.0,
+                resolution=0.01,
+                orient=tk.HORIZONTAL,
+                showvalue=False,
+                length=200,
+                bg=BG,
+                fg=FG,
+                troughcolor=BUTTON_BG,
+                highlightthickness=0,
+                command=lambda v: None,
+            )
+            opacity_scale.set(pending_overlay_opacity.get())
+            opacity_scale.pack(side=tk.LEFT, padx=(0, 8))
+            tk.Label(op_row, textvariable=overlay_opacity_label_var, width=6, anchor="w").pack(side=tk.LEFT)
 
-        tk.Label(delay_section, text="Milliseconds between key presses:", anchor="w").pack(
-            fill=tk.X, pady=(4, 4)
-        )
-        delay_var = tk.StringVar(value=str(int(self.state.macro_delay * 1000)))
-        delay_entry = tk.Entry(delay_section, textvariable=delay_var, width=10)
-        delay_entry.pack(anchor="w", pady=(0, 4))
+            def on_overlay_opacity_change(val: str) -> None:
+                pending_overlay_opacity.set(_clamp_opacity(float(val)))
+                overlay_opacity_label_var.set(f"{int(_clamp_opacity(float(val)) * 100)}%")
 
-        tk.Label(delay_section, text="Milliseconds key stays pressed:", anchor="w").pack(
-            fill=tk.X, pady=(8, 4)
-        )
-        duration_var = tk.StringVar(value=str(int(self.state.macro_duration * 1000)))
-        duration_entry = tk.Entry(delay_section, textvariable=duration_var, width=10)
-        duration_entry.pack(anchor="w", pady=(0, 4))
+            opacity_scale.config(command=on_overlay_opacity_change)
 
-        def apply_delay() -> None:
-            try:
-                ms_delay = float(delay_var.get())
-                ms_duration = float(duration_var.get())
-                if ms_delay < 0 or ms_duration < 0:
-                    raise ValueError
-                active_values["delay"] = ms_delay / 1000.0
-                active_values["duration"] = ms_duration / 1000.0
-                status_local.set(
-                    f"Pending delay {ms_delay:.0f} ms, duration {ms_duration:.0f} ms. Click Apply to confirm."
-                )
-            except ValueError:
-                messagebox.showerror("Invalid delay/duration", "Enter non-negative numbers (milliseconds).")
+        def build_delay_section() -> None:
+            tk.Label(delay_section, text="Milliseconds between key presses:", anchor="w").pack(
+                fill=tk.X, pady=(4, 4)
+            )
+            delay_var = tk.StringVar(value=str(int(self.state.macro_delay * 1000)))
+            delay_entry = tk.Entry(delay_section, textvariable=delay_var, width=10)
+            delay_entry.pack(anchor="w", pady=(0, 4))
 
-        tk.Button(delay_section, text="Apply Delay", command=apply_delay).pack(anchor="w")
+            tk.Label(delay_section, text="Milliseconds key stays pressed:", anchor="w").pack(
+                fill=tk.X, pady=(8, 4)
+            )
+            duration_var = tk.StringVar(value=str(int(self.state.macro_duration * 1000)))
+            duration_entry = tk.Entry(delay_section, textvariable=duration_var, width=10)
+            duration_entry.pack(anchor="w", pady=(0, 4))
 
-        switch_category("slot")
+            def apply_delay() -> None:
+                try:
+                    ms_delay = float(delay_var.get())
+                    ms_duration = float(duration_var.get())
+                    if ms_delay < 0 or ms_duration < 0:
+                        raise ValueError
+                    active_values["delay"] = ms_delay / 1000.0
+                    active_values["duration"] = ms_duration / 1000.0
+                    mark_dirty(
+                        DIRTY_TIMING,
+                        active_values["delay"] != self.state.macro_delay
+                        or active_values["duration"] != self.state.macro_duration,
+                    )
+                    status_local.set(
+                        f"Pending delay {ms_delay:.0f} ms, duration {ms_duration:.0f} ms. Click Apply to confirm."
+                    )
+                except ValueError:
+                    messagebox.showerror("Invalid delay/duration", "Enter non-negative numbers (milliseconds).")
+
+            tk.Button(delay_section, text="Apply Delay", command=apply_delay).pack(anchor="w")
+
+        # Sections are built the first time their tab is shown, so opening the
+        # dialog only pays for the widgets on the starting tab.
+        section_builders = {
+            "slot": (slot_section, build_slot_section),
+            "direction": (dir_section, build_direction_section),
+            "panel": (panel_section, build_panel_section),
+            "overlay": (overlay_section, build_overlay_section),
+            "delay": (delay_section, build_delay_section),
+        }
+        built_sections: set[str] = set()
+
+        def ensure_section_built(target: str) -> None:
+            if target in built_sections:
+                return
+            built_sections.add(target)
+            section, build = section_builders[target]
+            build()
+            if capturing["active"]:
+                for btn in _all_capture_buttons():
+                    btn.config(state=tk.DISABLED)
+            apply_dark_theme(section)
 
         status_label_local = tk.Label(settings, textvariable=status_local, anchor="w", wraplength=320)
         status_label_local.pack(fill=tk.X, padx=10, pady=(4, 8))
@@ -778,7 +946,10 @@ class MacroApp:
         tk.Button(btn_frame, text="Apply", command=apply_and_stay).pack(side=tk.LEFT)
         tk.Button(btn_frame, text="Close", command=settings.destroy).pack(side=tk.RIGHT)
 
+        # Theme the window shell once before any section exists; ensure_section_built
+        # then themes each section as it is built, so no subtree is walked twice.
         apply_dark_theme(settings)
+        switch_category("slot")
         refresh_labels()
 
     def _open_edit_templates(self) -> None:
@@ -823,14 +994,29 @@ class MacroApp:
 
         current_index = {"val": None}
 
+        # Names currently in the listbox, so a refresh only rewrites the rows that differ.
+        shown_names: list[str] = []
+        search_job = {"id": None}
+
         def refresh_list(select: int | None = None) -> None:
-            listbox.delete(0, tk.END)
             query = filter_var.get().strip().lower()
-            filtered: list[MacroTemplate] = []
-            for tpl in working:
-                if not query or query in tpl.name.lower() or query in tpl.category.lower():
-                    filtered.append(tpl)
-                    listbox.insert(tk.END, tpl.name)
+            filtered: list[MacroTemplate] = [
+                tpl
+                for tpl in working
+                if not query or query in tpl.name.lower() or query in tpl.category.lower()
+            ]
+            names = [tpl.name for tpl in filtered]
+            keep = 0
+            for old_name, new_name in zip(shown_names, names):
+                if old_name != new_name:
+                    break
+                keep += 1
+            listbox.selection_clear(0, tk.END)
+            if keep < len(shown_names):
+                listbox.delete(keep, tk.END)
+            if keep < len(names):
+                listbox.insert(tk.END, *names[keep:])
+            shown_names[:] = names
             listbox._filtered = filtered  # type: ignore[attr-defined]
             if select is not None and listbox.size() and 0 <= select < listbox.size():
                 listbox.selection_set(select)
@@ -905,9 +1091,23 @@ class MacroApp:
                 return
             load_selection(sel[0])
 
-        def on_search(*args):  # noqa: ANN001
+        def run_search() -> None:
+            search_job["id"] = None
             refresh_list(0)
 
+        def on_search(*args):  # noqa: ANN001
+            # Debounce so a burst of typing filters once, after the last keystroke.
+            if search_job["id"] is not None:
+                edit.after_cancel(search_job["id"])
+            search_job["id"] = edit.after(80, run_search)
+
+        def on_edit_destroy(event: tk.Event) -> None:
+            # A search still pending when the window closes would hit a dead listbox.
+            if event.widget is edit and search_job["id"] is not None:
+                edit.after_cancel(search_job["id"])
+                search_job["id"] = None
+
+        edit.bind("<Destroy>", on_edit_destroy, add="+")
         listbox.bind("<<ListboxSelect>>", on_select)
         filter_var.trace_add("write", on_search)
         if working:
@@ -948,7 +1148,8 @@ class MacroApp:
             self.overlay.resize_to_parent()
 
     # -- Menu helpers ----------------------------------------------------- #
-    def _popup_menu(self, menu: tk.Menu, btn: tk.Button) -> None:
+    def _popup_menu(self, menu: tk.Menu) -> None:
+        btn = self._menu_anchors[menu]
         try:
             x = btn.winfo_rootx()
             y = btn.winfo_rooty() + btn.winfo_height()
@@ -959,22 +1160,6 @@ class MacroApp:
             except tk.TclError:
                 pass
 
-    def _refresh_menu_bar_colors(self) -> None:
-        self.menu_bar.configure(bg=MENU_BG)
-        for child in self.menu_bar.winfo_children():
-            try:
-                child.configure(
-                    bg=MENU_BG,
-                    fg=FG,
-                    activebackground=BUTTON_ACTIVE,
-                    activeforeground=FG,
-                    relief=tk.FLAT,
-                    bd=0,
-                    highlightthickness=0,
-                )
-            except tk.TclError:
-                pass
-
     # -- Hotkeys & exit --------------------------------------------------- #
     def _register_overlay_lock_hotkey(self) -> None:
         if self.overlay_lock_handle is not None:
@@ -994,26 +1179,32 @@ class MacroApp:
             log(f"Could not register overlay lock hotkey '{key}': {exc}")
 
     def _register_exit_hotkey(self) -> None:
-        self.exit_handle = keyboard.add_hotkey(EXIT_HOTKEY, lambda: self.root.after(0, self._attempt_exit))
+        self.exit_handle = keyboard.add_hotkey(EXIT_HOTKEY, self._request_exit_from_thread)
 
     # -- Persistence helpers --------------------------------------------- #
     def _record_last_profile(self, path: Path) -> None:
+        text = str(path)
+        # Saving or reloading the same profile again would rewrite identical bytes.
+        if text == self._recorded_profile:
+            return
         try:
-            self.last_profile_marker.write_text(str(path), encoding="utf-8")
+            self.last_profile_marker.write_text(text, encoding="utf-8")
         except OSError:
-            pass
+            return
+        self._recorded_profile = text
 
     def _load_last_profile(self) -> None:
-        if self.last_profile_marker.exists():
-            try:
-                last_path = Path(self.last_profile_marker.read_text(encoding="utf-8").strip())
-                if last_path.exists():
-                    if self._load_profile_from_path(last_path, show_messages=False):
-                        log(f"Loaded last profile: {last_path.name}")
-                else:
-                    log(f"Last profile not found; expected at {last_path}")
-            except OSError:
-                pass
+        # EAFP: one open each for the marker and the profile, no exists() probes.
+        try:
+            marker_text = self.last_profile_marker.read_text(encoding="utf-8").strip()
+        except (OSError, ValueError):
+            return
+        self._recorded_profile = marker_text
+        last_path = Path(marker_text)
+        if self._load_profile_from_path(last_path, show_messages=False):
+            log(f"Loaded last profile: {last_path.name}")
+        elif not last_path.exists():
+            log(f"Last profile not found; expected at {last_path}")
 
     # -- Exit ------------------------------------------------------------- #
     def _maybe_save_before_exit(self) -> bool:
@@ -1040,25 +1231,43 @@ class MacroApp:
             return False
         path = Path(path_str)
         if self._save_profile_to_path(path, show_message=False):
-            self.saved_state = self._serialize_state()
             messagebox.showinfo("Profile saved", f"Saved to {path.name}.")
             return True
         return False
 
     def _close_app(self) -> None:
-        if self.exit_handle is not None:
-            keyboard.remove_hotkey(self.exit_handle)
-            self.exit_handle = None
-        if self.overlay_lock_handle is not None:
+        if self._closing:
+            return
+        # Swap each handle out before removing it, so a second exit request that
+        # slips in (window close racing the hotkey) never unregisters it twice.
+        exit_handle, self.exit_handle = self.exit_handle, None
+        if exit_handle is not None:
+            keyboard.remove_hotkey(exit_handle)
+        lock_handle, self.overlay_lock_handle = self.overlay_lock_handle, None
+        if lock_handle is not None:
             try:
-                keyboard.remove_hotkey(self.overlay_lock_handle)
+                keyboard.remove_hotkey(lock_handle)
             except Exception:
                 pass
-            self.overlay_lock_handle = None
         self.manager.shutdown()
         clear_log_callback()
-        self.overlay.hide()
-        self.root.destroy()
+        self._write_stdout_log(self._take_log_lines())
+        self._closing = True
+        # quit() only ends mainloop, not a dialog's nested wait_window, so close
+        # any open Toplevels first or an exit from the hotkey would wait on them.
+        for child in self.root.winfo_children():
+            if isinstance(child, tk.Toplevel):
+                try:
+                    child.destroy()
+                except tk.TclError:
+                    pass
+        # Stop the event loop; run() tears the rest of the widget tree down in one
+        # go once mainloop has returned, with no queued redraws or timers in between.
+        self.root.quit()
+
+    def _request_exit_from_thread(self) -> None:
+        """Trampoline for the keyboard hotkey thread; Tk-thread callers use _attempt_exit."""
+        self.root.after(0, self._attempt_exit)
 
     def _attempt_exit(self) -> None:
         if self._maybe_save_before_exit():
@@ -1067,6 +1276,10 @@ class MacroApp:
     # -- Run -------------------------------------------------------------- #
     def run(self) -> None:
         self.root.mainloop()
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass
 
 
 def main() -> None:
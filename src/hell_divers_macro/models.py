@@ -1,11 +1,10 @@
 from dataclasses import dataclass
-from typing import Callable, Tuple
+from typing import Tuple
 
 from .config import DEFAULT_DELAY, DEFAULT_DURATION
 
-HotkeyHandle = Callable[[], None]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Macro:
     hotkey: str
     keys: Tuple[str, ...]
@@ -14,13 +13,13 @@ class Macro:
     name: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MacroRecord:
     macro: Macro
-    handle: tuple[HotkeyHandle, HotkeyHandle]
+    scan_codes: tuple[int, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MacroTemplate:
     name: str
     directions: Tuple[str, ...]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+"""Windows low-level keyboard hook that only wakes Python logic for watched scancodes."""
+
+import sys
+import threading
+from typing import Callable, Iterable
+
+IS_WINDOWS = sys.platform == "win32"
+
+# Hook callback: (scan_code, is_down, is_extended).
+KeyCallback = Callable[[int, bool, bool], None]
+
+_SCANCODE_SLOTS = 512
+
+
+class NativeKeyHook:
+    """Own a WH_KEYBOARD_LL hook on a dedicated message-pump thread.
+
+    The hook procedure checks a flat per-scancode table before doing anything
+    else, so unrelated keys cost one byte read and an immediate CallNextHookEx.
+    Watched keys are forwarded to ``callback`` on the hook thread, which must
+    return quickly (Windows drops hooks that stall).
+    """
+
+    def __init__(self, callback: KeyCallback) -> None:
+        if not IS_WINDOWS:
+            raise OSError("NativeKeyHook requires Windows")
+        self._callback = callback
+        self._active = bytearray(_SCANCODE_SLOTS)
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        self._error: Exception | None = None
+        self._proc = None  # keep the ctypes callback alive while hooked
+
+    def set_active(self, scan_codes: Iterable[int]) -> None:
+        """Replace the set of scancodes that reach the callback."""
+        active = bytearray(_SCANCODE_SLOTS)
+        for sc in scan_codes:
+            if 0 <= sc < _SCANCODE_SLOTS:
+                active[sc] = 1
+        self._active = active
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._pump, name="native-key-hook", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=2.0)
+        if self._error is not None:
+            raise self._error
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        if self._thread_id:
+            import ctypes
+
+            WM_QUIT = 0x0012
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        thread.join(timeout=1.0)
+        self._thread = None
+        self._thread_id = 0
+
+    def _pump(self) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        WH_KEYBOARD_LL = 13
+        WM_KEYDOWN = 0x0100
+        WM_SYSKEYDOWN = 0x0104
+        LLKHF_EXTENDED = 0x01
+        LLKHF_INJECTED = 0x10
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [
+                ("vkCode", wintypes.DWORD),
+                ("scanCode", wintypes.DWORD),
+                ("flags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.SetWindowsHookExW.argtypes = (ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD)
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.CallNextHookEx.restype = LRESULT
+        user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+        kbd_ptr = ctypes.POINTER(KBDLLHOOKSTRUCT)
+        call_next = user32.CallNextHookEx
+        callback = self._callback
+
+        def proc(n_code: int, w_param: int, l_param: int) -> int:
+            if n_code == 0:
+                info = ctypes.cast(l_param, kbd_ptr).contents
+                sc = info.scanCode
+                # Ignore our own SendInput output so macros can't retrigger themselves.
+                if sc < _SCANCODE_SLOTS and self._active[sc] and not info.flags & LLKHF_INJECTED:
+                    try:
+                        callback(
+                            sc,
+                            w_param in (WM_KEYDOWN, WM_SYSKEYDOWN),
+                            bool(info.flags & LLKHF_EXTENDED),
+                        )
+                    except Exception:
+                        pass
+            return call_next(None, n_code, w_param, l_param)
+
+        self._proc = HOOKPROC(proc)
+        self._thread_id = kernel32.GetCurrentThreadId()
+        hook = user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._proc, None, 0)
+        if not hook:
+            self._error = OSError(f"SetWindowsHookExW failed ({ctypes.GetLastError()})")
+            self._thread_id = 0
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            user32.UnhookWindowsHookEx(hook)
+            self._proc = None
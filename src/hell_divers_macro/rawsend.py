@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+"""Direct scancode injection that skips the keyboard library's per-call name lookup."""
+
+import sys
+import time
+from typing import Sequence
+
+import keyboard
+
+IS_WINDOWS = sys.platform == "win32"
+
+# Navigation keys share scancodes with the numpad and need the 0xE0 prefix flag.
+_EXTENDED_KEYS = frozenset(
+    {
+        "up",
+        "down",
+        "left",
+        "right",
+        "home",
+        "end",
+        "page up",
+        "page down",
+        "insert",
+        "delete",
+        "right ctrl",
+        "right alt",
+        "left windows",
+        "right windows",
+    }
+)
+
+# (scancode, extended) pair resolved once per key name.
+ResolvedKey = tuple[int, bool]
+
+# One playable step: (name, down, up). down/up are platform-specific prebuilt
+# payloads, or None when the key has to go through the keyboard library by name.
+PreparedKey = tuple[str, object, object]
+
+# Below this many seconds, spin on perf_counter instead of trusting time.sleep.
+_SPIN_THRESHOLD = 0.002
+
+
+def resolve_key(name: str) -> ResolvedKey | None:
+    """Return the scancode for a key name, or None if the library can't map it."""
+    try:
+        codes = keyboard.key_to_scan_codes(name)
+    except (ValueError, KeyError):
+        return None
+    if not codes:
+        return None
+    return (codes[0], name.lower() in _EXTENDED_KEYS)
+
+
+if IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_EXTENDEDKEY = 0x0001
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_SCANCODE = 0x0008
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class _INPUTUNION(ctypes.Union):
+        # MOUSEINPUT is the largest member; it keeps sizeof(INPUT) what SendInput expects.
+        _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _anonymous_ = ("u",)
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+    _SendInput = ctypes.windll.user32.SendInput
+    _SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    _SendInput.restype = wintypes.UINT
+    _INPUT_SIZE = ctypes.sizeof(INPUT)
+
+    def _build_input(sc: int, extended: bool, release: bool):  # noqa: ANN202
+        flags = KEYEVENTF_SCANCODE
+        if extended:
+            flags |= KEYEVENTF_EXTENDEDKEY
+        if release:
+            flags |= KEYEVENTF_KEYUP
+        inp = INPUT(type=INPUT_KEYBOARD)
+        inp.ki = KEYBDINPUT(0, sc, flags, 0, 0)
+        # The pointer keeps the struct alive, so it can be cached and resubmitted.
+        return ctypes.pointer(inp)
+
+    def _prepare(sc: int, extended: bool) -> tuple[object, object]:
+        return (_build_input(sc, extended, False), _build_input(sc, extended, True))
+
+    def _send_down(prepared) -> None:  # noqa: ANN001
+        _SendInput(1, prepared, _INPUT_SIZE)
+
+    _send_up = _send_down
+
+else:
+
+    def _prepare(sc: int, extended: bool) -> tuple[object, object]:
+        return (sc, sc)
+
+    # Passing the integer scancode skips the keyboard library's name parsing.
+    _send_down = keyboard.press
+    _send_up = keyboard.release
+
+
+def precise_wait(deadline: float) -> None:
+    """Block until perf_counter reaches deadline: coarse sleep, then spin."""
+    remaining = deadline - time.perf_counter()
+    if remaining > _SPIN_THRESHOLD:
+        time.sleep(remaining - 0.001)
+    while time.perf_counter() < deadline:
+        pass
+
+
+def prepare_sequence(
+    names: Sequence[str], resolved: Sequence[ResolvedKey | None]
+) -> tuple[PreparedKey, ...]:
+    """Build the per-key send payloads once so playback does no struct setup."""
+    steps: list[PreparedKey] = []
+    for name, code in zip(names, resolved):
+        if code is None:
+            steps.append((name, None, None))
+        else:
+            steps.append((name, *_prepare(*code)))
+    return tuple(steps)
+
+
+def run_prepared(steps: Sequence[PreparedKey], duration: float, delay: float) -> None:
+    """Play prepared steps against a single perf_counter deadline schedule.
+
+    Everything the loop touches is bound to locals up front so each key costs
+    two sends and two waits with no attribute or global lookups in between.
+    """
+    send_down = _send_down
+    send_up = _send_up
+    kb_press = keyboard.press
+    kb_release = keyboard.release
+    wait = precise_wait
+    deadline = time.perf_counter()
+    for name, down, up in steps:
+        if down is None:
+            kb_press(name)
+        else:
+            send_down(down)
+        deadline += duration
+        wait(deadline)
+        if up is None:
+            kb_release(name)
+        else:
+            send_up(up)
+        deadline += delay
+        wait(deadline)
@@ -14,7 +14,7 @@ from hell_divers_macro.config import (
     DEFAULT_OVERLAY_OPACITY,
     DEFAULT_PANEL_KEY,
     DEFAULT_SLOT_HOTKEYS,
-    NUMPAD_SLOTS,
+    NUMPAD_SLOT_NAMES,
 )
 from hell_divers_macro.models import MacroTemplate
 
@@ -22,7 +22,7 @@ from hell_divers_macro.models import MacroTemplate
 @dataclass
 class AppState:
     assignments: Dict[str, MacroTemplate | None] = field(
-        default_factory=lambda: {slot: None for slot, _ in NUMPAD_SLOTS}
+        default_factory=lambda: dict.fromkeys(NUMPAD_SLOT_NAMES)
     )
     slot_hotkeys: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_SLOT_HOTKEYS))
     direction_keys: Dict[str, str] = field(default_factory=lambda: dict(DEFAULT_DIRECTION_KEYS))
@@ -46,8 +46,24 @@ class AppState:
             },
         }
 
+    def fingerprint(self) -> int:
+        """Cheap structural hash of everything serialize() writes, for dirty checks."""
+        return hash(
+            (
+                tuple((slot, tpl.name if tpl else None) for slot, tpl in self.assignments.items()),
+                frozenset(self.slot_hotkeys.items()),
+                frozenset(self.direction_keys.items()),
+                self.macro_delay,
+                self.macro_duration,
+                self.panel_key,
+                bool(self.auto_panel),
+                self.overlay_lock_key,
+                self.overlay_opacity,
+            )
+        )
+
     def reset(self) -> None:
-        self.assignments = {slot: None for slot, _ in NUMPAD_SLOTS}
+        self.assignments = dict.fromkeys(NUMPAD_SLOT_NAMES)
         self.slot_hotkeys = dict(DEFAULT_SLOT_HOTKEYS)
         self.direction_keys = dict(DEFAULT_DIRECTION_KEYS)
         self.panel_key = DEFAULT_PANEL_KEY
@@ -61,12 +77,14 @@ class AppState:
         """Load state from a profile dict; returns missing macro names."""
         slots_data = data.get("slots", {})
         missing: list[str] = []
-        for slot, _ in NUMPAD_SLOTS:
+        # Reversed so the first template wins on duplicate names, as a linear scan would.
+        tpl_by_name = {t.name: t for t in reversed(templates)}
+        for slot in NUMPAD_SLOT_NAMES:
             name = slots_data.get(slot)
             if name is None:
                 self.assignments[slot] = None
                 continue
-            tpl = next((t for t in templates if t.name == name), None)
+            tpl = tpl_by_name.get(name)
             if tpl is None:
                 missing.append(name)
                 self.assignments[slot] = None
@@ -75,7 +93,7 @@ class AppState:
 
         hotkeys_data = data.get("hotkeys", {})
         if isinstance(hotkeys_data, dict):
-            for slot, _ in NUMPAD_SLOTS:
+            for slot in NUMPAD_SLOT_NAMES:
                 hk = hotkeys_data.get(slot)
                 if isinstance(hk, str) and hk.strip():
                     self.slot_hotkeys[slot] = hk.strip()
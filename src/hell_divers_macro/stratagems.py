@@ -1,3 +1,4 @@
+import functools
 from typing import Dict, Tuple
 
 from .config import DEFAULT_DELAY, DEFAULT_DIRECTION_KEYS, DEFAULT_DURATION
@@ -47,6 +48,15 @@ def load_stratagem_templates() -> Tuple[MacroTemplate, ...]:
 def resolve_template_keys(
     template: MacroTemplate, direction_keys: Dict[str, str]
 ) -> Tuple[str, ...]:
+    return _resolve_template_keys_cached(template, tuple(direction_keys.items()))
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_template_keys_cached(
+    template: MacroTemplate, direction_items: Tuple[Tuple[str, str], ...]
+) -> Tuple[str, ...]:
+    # Templates are frozen and the bindings are part of the key, so entries never go stale.
+    direction_keys = dict(direction_items)
     keys: list[str] = []
     for direction in template.directions:
         mapped = direction_keys.get(direction) or DEFAULT_DIRECTION_KEYS.get(direction)
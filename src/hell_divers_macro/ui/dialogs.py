@@ -15,6 +15,27 @@ from hell_divers_macro.ui.theme import (
 )
 
 
+def _open_toplevel(parent: tk.Tk, title: str) -> tk.Toplevel:
+    top = tk.Toplevel(parent, bg=BG)
+    top.title(title)
+    top.transient(parent)
+    return top
+
+
+def _run_modal(top: tk.Toplevel, parent: tk.Tk, focus: tk.Widget) -> None:
+    """Theme, place and show a fully built dialog, then block until it closes.
+
+    Theming happens before placement so the window is measured at its final size,
+    and the tree is walked once after every widget exists.
+    """
+    apply_dark_theme(top)
+    place_window_near(top, parent)
+    set_dark_titlebar(top)
+    top.grab_set()
+    focus.focus_set()
+    parent.wait_window(top)
+
+
 class MacroSelectionDialog:
     """Listbox + tabs for selecting a MacroTemplate."""
 
@@ -23,6 +44,10 @@ class MacroSelectionDialog:
         self.templates = templates
         self.result = None
         self._current_selection = None
+        self._search_job: str | None = None
+        self._layout_job: str | None = None
+        # Lowercased once so search keystrokes don't re-lowercase every name.
+        self._tpl_lower = [tpl.name.lower() for tpl in self.templates]
 
         categories: dict[str, list] = {}
         for tpl in self.templates:
@@ -30,9 +55,7 @@ class MacroSelectionDialog:
         ordered_categories = list(categories.keys())
         visible: list = []
 
-        self.top = tk.Toplevel(parent, bg=BG)
-        self.top.title(title)
-        self.top.transient(parent)
+        self.top = _open_toplevel(parent, title)
 
         tk.Label(self.top, text="Choose a macro template:").pack(anchor="w", pady=(8, 4), padx=10)
 
@@ -57,19 +80,29 @@ class MacroSelectionDialog:
 
         current_cat = {"val": ordered_categories[0] if ordered_categories else ""}
         visible = list(self.templates)
+        # Templates currently in the listbox, so a refresh only rewrites the rows that differ.
+        shown: list = []
 
         def populate_list(cat: str | None, query: str) -> None:
-            self.listbox.delete(0, tk.END)
             q = query.strip().lower()
             nonlocal visible
             if q:
-                visible = [tpl for tpl in self.templates if q in tpl.name.lower()]
+                visible = [tpl for tpl, lower in zip(self.templates, self._tpl_lower) if q in lower]
             elif cat:
                 visible = list(categories.get(cat, []))
             else:
                 visible = list(self.templates)
-            for tpl in visible:
-                self.listbox.insert(tk.END, tpl.name)
+            keep = 0
+            for old, new in zip(shown, visible):
+                if old is not new:
+                    break
+                keep += 1
+            self.listbox.selection_clear(0, tk.END)
+            if keep < len(shown):
+                self.listbox.delete(keep, tk.END)
+            if keep < len(visible):
+                self.listbox.insert(tk.END, *(tpl.name for tpl in visible[keep:]))
+            shown[:] = visible
             self._current_selection = None
 
         def switch_cat(cat: str) -> None:
@@ -78,7 +111,6 @@ class MacroSelectionDialog:
                 btn.config(relief=tk.RAISED)
             tab_buttons[cat].config(relief=tk.SUNKEN)
             populate_list(cat, search_var.get())
-            layout_tabs()
 
         tab_buttons_list: list[tuple[str, tk.Button]] = []
         tab_buttons: dict[str, tk.Button] = {}
@@ -87,25 +119,46 @@ class MacroSelectionDialog:
             tab_buttons[cat] = btn
             tab_buttons_list.append((cat, btn))
 
-        def layout_tabs(event=None) -> None:  # noqa: ANN001
-            tabs_frame.update_idletasks()
-            available = tabs_frame.winfo_width()
+        # Tab labels never change, so each button is measured once; cells remember
+        # where each button sits so a relayout only re-grids the ones that move.
+        tab_widths: list[int] = []
+        tab_cells: list[tuple[int, int] | None] = [None] * len(tab_buttons_list)
+        laid_out_width = {"val": None}
+
+        def layout_tabs(available: int) -> None:
             if available <= 1:
                 available = self.top.winfo_width() - 20
+            if available == laid_out_width["val"]:
+                return
+            laid_out_width["val"] = available
+            if not tab_widths:
+                tab_widths.extend(btn.winfo_reqwidth() + 6 for _, btn in tab_buttons_list)
             x = 0
             row = 0
             col = 0
-            for _, btn in tab_buttons_list:
-                w = btn.winfo_reqwidth() + 6
+            for i, (_, btn) in enumerate(tab_buttons_list):
+                w = tab_widths[i]
                 if col > 0 and x + w > available:
                     row += 1
                     col = 0
                     x = 0
-                btn.grid(row=row, column=col, padx=(0, 6), pady=2, sticky="w")
+                if tab_cells[i] != (row, col):
+                    btn.grid(row=row, column=col, padx=(0, 6), pady=2, sticky="w")
+                    tab_cells[i] = (row, col)
                 col += 1
                 x += w
 
-        tabs_frame.bind("<Configure>", layout_tabs)
+        def run_layout(width: int) -> None:
+            self._layout_job = None
+            layout_tabs(width)
+
+        def queue_layout(event) -> None:  # noqa: ANN001
+            # <Configure> fires per pixel during a drag-resize; lay out once it settles.
+            if self._layout_job is not None:
+                self.top.after_cancel(self._layout_job)
+            self._layout_job = self.top.after(16, run_layout, event.width)
+
+        tabs_frame.bind("<Configure>", queue_layout)
 
         def handle_select(event=None) -> None:  # noqa: ANN001
             indices = self.listbox.curselection()
@@ -119,9 +172,16 @@ class MacroSelectionDialog:
         self.listbox.bind("<<ListboxSelect>>", handle_select)
         self.listbox.bind("<Double-Button-1>", lambda _: (handle_select(), self.ok()))
 
-        def on_search(*args: str) -> None:  # noqa: ANN001
+        def run_search() -> None:
+            self._search_job = None
             populate_list(current_cat["val"], search_var.get())
 
+        def on_search(*args: str) -> None:  # noqa: ANN001
+            # Debounce so a burst of typing filters once, after the last keystroke.
+            if self._search_job is not None:
+                self.top.after_cancel(self._search_job)
+            self._search_job = self.top.after(80, run_search)
+
         search_var.trace_add("write", on_search)
 
         btn_frame = tk.Frame(self.top, bg=BG)
@@ -130,30 +190,37 @@ class MacroSelectionDialog:
         tk.Button(btn_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT)
 
         self.top.protocol("WM_DELETE_WINDOW", self.cancel)
-        self.top.grab_set()
-        place_window_near(self.top, parent)
-        self.top.focus_set()
+        # Themed up front so tab widths are measured with the final fonts;
+        # _run_modal's own apply_dark_theme call is then a no-op.
         apply_dark_theme(self.top)
-        set_dark_titlebar(self.top)
 
         if ordered_categories:
             switch_cat(ordered_categories[0])
+            tabs_frame.update_idletasks()
+            layout_tabs(tabs_frame.winfo_width())
 
-        self.top.update_idletasks()
+        # Clamp to the parent's width before placing, so it is centred at its real size.
         parent_width = parent.winfo_width()
         if parent_width > 0:
+            self.top.update_idletasks()
             reqw = self.top.winfo_reqwidth()
-            reqh = self.top.winfo_reqheight()
             if reqw > parent_width:
-                self.top.geometry(f"{parent_width}x{reqh}")
-        parent.wait_window(self.top)
+                self.top.geometry(f"{parent_width}x{self.top.winfo_reqheight()}")
+        _run_modal(self.top, parent, self.top)
 
     def ok(self) -> None:
         self.result = self._current_selection
-        self.top.destroy()
+        self._close()
 
     def cancel(self) -> None:
         self.result = None
+        self._close()
+
+    def _close(self) -> None:
+        for job in (self._search_job, self._layout_job):
+            if job is not None:
+                self.top.after_cancel(job)
+        self._search_job = self._layout_job = None
         self.top.destroy()
 
 
@@ -162,9 +229,7 @@ class TextEntryDialog:
 
     def __init__(self, parent: tk.Tk, title: str, prompt: str, initial: str = "") -> None:
         self.result: str | None = None
-        self.top = tk.Toplevel(parent, bg=BG)
-        self.top.title(title)
-        self.top.transient(parent)
+        self.top = _open_toplevel(parent, title)
 
         tk.Label(self.top, text=prompt).pack(anchor="w", padx=10, pady=(10, 4))
         self.entry_var = tk.StringVar(value=initial)
@@ -179,12 +244,7 @@ class TextEntryDialog:
         self.top.protocol("WM_DELETE_WINDOW", self.cancel)
         self.top.bind("<Return>", lambda _: self.ok())
         self.top.bind("<Escape>", lambda _: self.cancel())
-        self.top.grab_set()
-        place_window_near(self.top, parent)
-        entry.focus_set()
-        apply_dark_theme(self.top)
-        set_dark_titlebar(self.top)
-        parent.wait_window(self.top)
+        _run_modal(self.top, parent, entry)
 
     def ok(self) -> None:
         self.result = self.entry_var.get()
@@ -2,15 +2,22 @@ from __future__ import annotations
 
 """Icon loading and placeholder helpers."""
 
+import functools
+import hashlib
 import io
+import os
 import re
 import sys
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Callable, Dict, Tuple
 
 from PIL import Image, ImageDraw, ImageFont, ImageTk
 
 from hell_divers_macro.config import DEFAULT_OVERLAY_OPACITY
+from hell_divers_macro.paths import ensure_saves_dir
 
 ICON_SIZE: Tuple[int, int] = (120, 110)
 OVERLAY_ICON_SIZE: Tuple[int, int] = (96, 88)
@@ -29,6 +36,9 @@ def _resolve_assets_dir() -> Path:
 
 ASSETS_DIR = _resolve_assets_dir()
 APP_ICON_PATH = ASSETS_DIR / "helldivers_2_macro_icon.png"
+ICON_CACHE_DIR_NAME = ".icon_cache"
+# <asset+size digest>_<svg content digest>.png; anything else in the directory is stale.
+_CACHE_FILE_RE = re.compile(r"[0-9a-f]{16}_[0-9a-f]{16}\.png")
 
 _cairosvg_mod = None
 _cairosvg_error = None
@@ -37,27 +47,70 @@ _HAS_CAIRO = False
 _svglib_mod = None
 _svglib_error = None
 _HAS_SVGLIB = False
+# Set once the "no SVG rasterizer" warning has been printed.
+_warned_no_rasterizer = False
 
-_icon_cache: dict[tuple[str, str, str, tuple[int, int]], ImageTk.PhotoImage] = {}
+IconKey = tuple[str, str, str, tuple[int, int]]
+
+# Bounded LRU of rendered icons. Widgets keep their own reference to the image
+# they display, so evicting here only frees icons nothing is showing.
+ICON_CACHE_SIZE = 64
+_icon_cache: OrderedDict[IconKey, ImageTk.PhotoImage] = OrderedDict()
 _overlay_placeholder_cache: dict[tuple[str, tuple[int, int]], ImageTk.PhotoImage] = {}
+# Background SVG renders in flight, with the callbacks waiting on each one.
+_pending_renders: dict[IconKey, list[Callable[[ImageTk.PhotoImage], None]]] = {}
+_icon_executor: ThreadPoolExecutor | None = None
+
 
+_NAME_RE = re.compile(r"[^a-z0-9]")
+_ASSET_SUFFIXES = (".png", ".svg")
 
+
+@functools.lru_cache(maxsize=2048)
 def _normalize_name(name: str) -> str:
     """Normalize names for matching against asset filenames."""
-    return re.sub(r"[^a-z0-9]", "", name.lower())
+    return _NAME_RE.sub("", name.lower())
 
 
 def _build_asset_map() -> dict[str, Path]:
-    mapping: dict[str, Path] = {}
-    if ASSETS_DIR.exists():
-        for pattern in ("*.png", "*.svg"):
-            for path in ASSETS_DIR.rglob(pattern):
-                key = _normalize_name(path.stem)
-                mapping.setdefault(key, path)
-    return mapping
-
+    """Index assets by normalized stem in a single directory walk.
 
-ASSET_MAP = _build_asset_map()
+    PNGs win over SVGs with the same name, matching the old png-then-svg scan.
+    """
+    pngs: dict[str, Path] = {}
+    svgs: dict[str, Path] = {}
+    if not ASSETS_DIR.exists():
+        return pngs
+    pending = [str(ASSETS_DIR)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                        continue
+                    stem, suffix = os.path.splitext(entry.name)
+                    suffix = suffix.lower()
+                    if suffix not in _ASSET_SUFFIXES:
+                        continue
+                    target = pngs if suffix == ".png" else svgs
+                    target.setdefault(_normalize_name(stem), Path(entry.path))
+        except OSError:
+            continue
+    for key, path in svgs.items():
+        pngs.setdefault(key, path)
+    return pngs
+
+
+_ASSET_MAP: dict[str, Path] | None = None
+
+
+def _asset_map() -> dict[str, Path]:
+    """Build the asset index on first icon lookup rather than at import."""
+    global _ASSET_MAP
+    if _ASSET_MAP is None:
+        _ASSET_MAP = _build_asset_map()
+    return _ASSET_MAP
 
 
 def _get_cairosvg():
@@ -111,11 +164,83 @@ def _svg_to_png_bytes(svg_bytes: bytes, target_size: tuple[int, int]) -> bytes |
     return None
 
 
+@functools.cache
+def _icon_cache_dir() -> Path | None:
+    """Resolve (and create) the on-disk raster cache once per process.
+
+    Files not named like a current cache entry (older key schemes) are removed here.
+    """
+    try:
+        path = ensure_saves_dir() / ICON_CACHE_DIR_NAME
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    for entry in path.glob("*.png"):
+        if not _CACHE_FILE_RE.fullmatch(entry.name):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+    return path
+
+
+def _disk_cache_name(
+    asset_path: Path, svg_bytes: bytes, size: tuple[int, int], assets_dir: Path
+) -> tuple[str, str]:
+    """Return (slot prefix, file name) for an unlabelled SVG raster.
+
+    The prefix identifies the asset (relative to assets_dir) and render size, so it
+    is the same in every frozen build's temporary extraction dir; the suffix hashes
+    the SVG bytes, so an edited asset gets a new file that replaces the old one.
+    """
+    try:
+        rel = asset_path.relative_to(assets_dir).as_posix()
+    except ValueError:
+        rel = asset_path.name
+    slot = f"{rel}|{size[0]}x{size[1]}"
+    prefix = hashlib.blake2b(slot.encode("utf-8"), digest_size=8).hexdigest()
+    content = hashlib.blake2b(svg_bytes, digest_size=8).hexdigest()
+    return prefix, f"{prefix}_{content}.png"
+
+
+def _disk_cache_path(asset_path: Path, svg_bytes: bytes, size: tuple[int, int]) -> Path | None:
+    """Return the on-disk PNG path for an SVG raster, dropping stale renders of the same asset and size."""
+    cache_dir = _icon_cache_dir()
+    if cache_dir is None:
+        return None
+    prefix, name = _disk_cache_name(asset_path, svg_bytes, size, ASSETS_DIR)
+    for stale in cache_dir.glob(f"{prefix}_*.png"):
+        if stale.name != name:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    return cache_dir / name
+
+
+@functools.cache
+def _font() -> ImageFont.ImageFont:
+    """Shared default font, loaded on first use."""
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=512)
+def _text_bbox(text: str, font: ImageFont.ImageFont) -> tuple[int, int, int, int]:
+    """Measure text once; slot labels are re-measured on every relabel otherwise."""
+    return ImageDraw.Draw(Image.new("RGBA", (1, 1))).textbbox((0, 0), text, font=font)
+
+
+@functools.lru_cache(maxsize=16)
+def _overlay_strip(width: int, height: int) -> Image.Image:
+    """Solid name-ribbon background, built once per size and pasted onto icons."""
+    return Image.new("RGBA", (width, height), (18, 18, 18, 180))
+
+
 def _draw_key_badge(draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, key_text: str) -> None:
     """Draw a small dark circle badge with the hotkey text."""
     if not key_text:
         return
-    bbox = draw.textbbox((0, 0), key_text, font=font)
+    bbox = _text_bbox(key_text, font)
     text_w = bbox[2] - bbox[0]
     text_h = bbox[3] - bbox[1]
     radius = int(max(text_w, text_h) / 2 + 6)
@@ -133,45 +258,78 @@ def _draw_key_badge(draw: ImageDraw.ImageDraw, font: ImageFont.ImageFont, key_te
     )
 
 
-def load_icon_image(
-    name: str, hotkey_text: str, *, variant: str = "full", size: tuple[int, int] | None = None
-) -> ImageTk.PhotoImage | None:
-    """Return a PhotoImage with icon overlays, or None if unavailable.
+def _cached_icon(cache_key: IconKey) -> ImageTk.PhotoImage | None:
+    photo = _icon_cache.get(cache_key)
+    if photo is not None:
+        _icon_cache.move_to_end(cache_key)
+    return photo
+
+
+def _store_icon(cache_key: IconKey, photo: ImageTk.PhotoImage) -> None:
+    _icon_cache[cache_key] = photo
+    _icon_cache.move_to_end(cache_key)
+    while len(_icon_cache) > ICON_CACHE_SIZE:
+        _icon_cache.popitem(last=False)
 
-    variant: "full" keeps the name ribbon; "badge" keeps only the key badge.
-    """
-    target_size = size or ICON_SIZE
-    cache_key = (name, hotkey_text, variant, target_size)
-    if cache_key in _icon_cache:
-        return _icon_cache[cache_key]
 
+@functools.lru_cache(maxsize=ICON_CACHE_SIZE)
+def _base_image(asset_path: Path, target_size: tuple[int, int]) -> Image.Image | None:
+    """Decode and resize an asset once; relabels reuse it. Callers must copy() before drawing."""
+    if asset_path.suffix.lower() == ".png":
+        image = Image.open(asset_path).convert("RGBA")
+        if image.size != target_size:
+            image = image.resize(target_size, Image.LANCZOS)
+        return image
+
+    # SVG rasterization is the slow path, so its raster is also kept on disk.
+    svg_bytes = asset_path.read_bytes()
+    disk_path = _disk_cache_path(asset_path, svg_bytes, target_size)
+    if disk_path is not None:
+        try:
+            return Image.open(disk_path).convert("RGBA")
+        except OSError:
+            pass
+    png_bytes = _svg_to_png_bytes(svg_bytes, target_size)
+    if png_bytes is None:
+        return None
+    image = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+    if image.size != target_size:
+        image = image.resize(target_size, Image.LANCZOS)
+    if disk_path is not None:
+        try:
+            image.save(disk_path, "PNG", optimize=False)
+        except OSError:
+            pass
+    return image
+
+
+def _render_icon(
+    name: str, hotkey_text: str, variant: str, target_size: tuple[int, int]
+) -> Image.Image | None:
+    """Compose the icon with its overlays as a PIL image.
+
+    Pure Pillow work with no Tk calls, so it is safe to run off the Tk thread.
+    """
+    global _warned_no_rasterizer
     key = _normalize_name(name)
-    asset_path = ASSET_MAP.get(key)
+    asset_path = _asset_map().get(key)
     if not asset_path or not asset_path.exists():
         return None
 
     try:
-        if asset_path.suffix.lower() == ".png":
-            image = Image.open(asset_path).convert("RGBA")
-            if image.size != target_size:
-                image = image.resize(target_size, Image.LANCZOS)
-        else:
-            svg_bytes = asset_path.read_bytes()
-            png_bytes = _svg_to_png_bytes(svg_bytes, target_size)
-            if png_bytes is None:
-                if not getattr(load_icon_image, "_warned", False):
-                    msg = "SVG rasterization unavailable; icons will not display."
-                    details = _cairosvg_error or _svglib_error
-                    if details:
-                        msg += f" ({details})"
-                    print(msg)
-                    load_icon_image._warned = True  # type: ignore[attr-defined]
-                return None
-            image = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
-            if image.size != target_size:
-                image = image.resize(target_size, Image.LANCZOS)
+        base = _base_image(asset_path, target_size)
+        if base is None:
+            if not _warned_no_rasterizer:
+                msg = "SVG rasterization unavailable; icons will not display."
+                details = _cairosvg_error or _svglib_error
+                if details:
+                    msg += f" ({details})"
+                print(msg)
+                _warned_no_rasterizer = True
+            return None
+        image = base.copy()
         draw = ImageDraw.Draw(image)
-        font = ImageFont.load_default()
+        font = _font()
 
         # Top-left hotkey label.
         key_text = hotkey_text.strip()
@@ -183,24 +341,88 @@ def load_icon_image(
 
         # Bottom name overlay.
         if variant == "full":
-            name_w, name_h = draw.textbbox((0, 0), name, font=font)[2:]
+            name_w, name_h = _text_bbox(name, font)[2:]
             overlay_height = name_h + 8
             y0 = image.height - overlay_height
-            draw.rectangle([0, y0, image.width, image.height], fill=(18, 18, 18, 180))
+            # Unmasked paste overwrites pixels exactly like the old filled rectangle did.
+            image.paste(_overlay_strip(image.width, overlay_height), (0, y0))
             draw.text(
                 ((image.width - name_w) / 2, y0 + 4),
                 name,
                 font=font,
                 fill=(229, 229, 229, 255),
             )
-
-        photo = ImageTk.PhotoImage(image)
-        _icon_cache[cache_key] = photo
-        return photo
+        return image
     except Exception:
         return None
 
 
+def _get_icon_executor() -> ThreadPoolExecutor:
+    global _icon_executor
+    if _icon_executor is None:
+        _icon_executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="icon-render"
+        )
+    return _icon_executor
+
+
+def request_icon_image(
+    widget: tk.Misc,
+    name: str,
+    hotkey_text: str,
+    on_ready: Callable[[ImageTk.PhotoImage], None],
+    *,
+    variant: str = "full",
+    size: tuple[int, int] | None = None,
+) -> ImageTk.PhotoImage | None:
+    """Return the icon now if it is cached, otherwise render it in the background.
+
+    Uncached icons (PNG decode/resize or SVG rasterization) are rendered on a
+    worker thread and ``on_ready`` is called with the PhotoImage on the Tk
+    thread once it exists; until then the caller should show its text fallback.
+
+    variant: "full" keeps the name ribbon; "badge" keeps only the key badge.
+    """
+    target_size = size or ICON_SIZE
+    cache_key = (name, hotkey_text, variant, target_size)
+    cached = _cached_icon(cache_key)
+    if cached is not None:
+        return cached
+    if _asset_map().get(_normalize_name(name)) is None:
+        return None
+
+    waiters = _pending_renders.get(cache_key)
+    if waiters is not None:
+        waiters.append(on_ready)
+        return None
+    _pending_renders[cache_key] = [on_ready]
+
+    def _finish(image: Image.Image | None) -> None:
+        # Runs on the Tk thread: PhotoImage must be created where Tk lives.
+        callbacks = _pending_renders.pop(cache_key, [])
+        if image is None:
+            return
+        try:
+            photo = ImageTk.PhotoImage(image)
+        except Exception:
+            return
+        _store_icon(cache_key, photo)
+        for callback in callbacks:
+            callback(photo)
+
+    def _done(future: Future) -> None:
+        image = None if future.exception() is not None else future.result()
+        try:
+            widget.after(0, lambda: _finish(image))
+        except (RuntimeError, tk.TclError):
+            # Window already gone; nothing left to paint.
+            _pending_renders.pop(cache_key, None)
+
+    future = _get_icon_executor().submit(_render_icon, name, hotkey_text, variant, target_size)
+    future.add_done_callback(_done)
+    return None
+
+
 def build_overlay_placeholder(
     hotkey_text: str, size: tuple[int, int] = OVERLAY_ICON_SIZE
 ) -> ImageTk.PhotoImage:
@@ -212,7 +434,7 @@ def build_overlay_placeholder(
     image = Image.new("RGBA", size, (26, 26, 26, 180))
     draw = ImageDraw.Draw(image)
     draw.rectangle((1, 1, size[0] - 2, size[1] - 2), outline=(70, 70, 70, 210), width=2)
-    font = ImageFont.load_default()
+    font = _font()
     _draw_key_badge(draw, font, label)
     photo = ImageTk.PhotoImage(image)
     _overlay_placeholder_cache[cache_key] = photo
@@ -6,11 +6,12 @@ import time
 import tkinter as tk
 from typing import Callable, Dict
 
+from hell_divers_macro.config import PROGRESS_TICK_MS
 from hell_divers_macro.ui.icons import (
     OVERLAY_ALPHA,
     OVERLAY_ICON_SIZE,
     build_overlay_placeholder,
-    load_icon_image,
+    request_icon_image,
 )
 from hell_divers_macro.ui.theme import (
     ACCENT,
@@ -51,7 +52,11 @@ class OverlayWindow:
         self.slot_canvases: dict[str, tk.Canvas] = {}
         self.fill_rects: dict[str, int] = {}
         self.icons: dict[str, tk.PhotoImage | None] = {}
-        self.progress: dict[str, dict[str, object]] = {}
+        # (name, hotkey text) each slot's icon was last requested for.
+        self._icon_keys: dict[str, tuple[str, str]] = {}
+        # slot -> (perf_counter start, duration) for fills currently animating.
+        self.progress: dict[str, tuple[float, float]] = {}
+        self._progress_job: str | None = None
         self.user_resized = False
         self.applying_config = False
         self.locked = False
@@ -119,11 +124,36 @@ class OverlayWindow:
         if canvas is None:
             return
         hotkey_text = self.hotkey_display(hotkey, slot)
-        icon: tk.PhotoImage | None
+        icon: tk.PhotoImage | None = None
         if tpl:
-            icon = load_icon_image(tpl.name, hotkey_text, variant="badge", size=OVERLAY_ICON_SIZE)
+            self._icon_keys[slot] = (tpl.name, hotkey_text)
+            icon = request_icon_image(
+                self.win,
+                tpl.name,
+                hotkey_text,
+                lambda photo, s=slot, k=(tpl.name, hotkey_text): self._on_icon_ready(s, k, photo),
+                variant="badge",
+                size=OVERLAY_ICON_SIZE,
+            )
         else:
+            self._icon_keys.pop(slot, None)
+        if icon is None:
             icon = build_overlay_placeholder(hotkey_text, size=OVERLAY_ICON_SIZE)
+        self._draw_icon(slot, icon)
+        self._set_fill(slot, 0)
+
+    def _on_icon_ready(self, slot: str, key: tuple[str, str], icon: tk.PhotoImage) -> None:
+        """Swap in a background-rendered icon unless the slot changed meanwhile."""
+        if self._icon_keys.get(slot) != key:
+            return
+        if self.win is None or not self.win.winfo_exists():
+            return
+        self._draw_icon(slot, icon)
+
+    def _draw_icon(self, slot: str, icon: tk.PhotoImage) -> None:
+        canvas = self.slot_canvases.get(slot)
+        if canvas is None:
+            return
         self.icons[slot] = icon
         canvas.delete("icon")
         canvas.create_image(
@@ -132,31 +162,35 @@ class OverlayWindow:
             image=icon,
             tags="icon",
         )
-        self._set_fill(slot, 0)
 
     def start_progress(self, slot: str, total_time: float | None) -> None:
         if self.win is None or not self.win.winfo_exists():
             return
         duration = max(total_time or 0.05, 0.05)
-        self._cancel_progress(slot)
-        self.progress[slot] = {"start": time.time(), "duration": duration, "job": None}
-        self._tick_progress(slot)
+        self.progress[slot] = (time.perf_counter(), duration)
+        self._set_fill(slot, 0)
+        if self._progress_job is None:
+            self._progress_job = self.root.after(PROGRESS_TICK_MS, self._tick_progress)
 
     def stop_progress(self, slot: str) -> None:
-        self._cancel_progress(slot)
+        self.progress.pop(slot, None)
         self._set_fill(slot, 0)
+        if not self.progress:
+            self._cancel_progress_tick()
 
     def resize_to_parent(self, force: bool = False) -> None:
         """Match the overlay size to the root window (unless the user resized)."""
         self._size_window(force)
 
     def handle_macro_progress(self, event: str, macro, slot: str | None, total_time: float | None) -> None:
+        """MacroManager progress callback; runs on its progress thread, so every
+        canvas update is handed to the Tk thread via after()."""
         if not slot:
             return
         if event == "start":
-            self.root.after(0, lambda s=slot, t=total_time: self.start_progress(s, t))
+            self.root.after(0, self.start_progress, slot, total_time)
         elif event == "stop":
-            self.root.after(0, lambda s=slot: self.stop_progress(s))
+            self.root.after(0, self.stop_progress, slot)
 
     # -- Window construction ---------------------------------------------- #
     def _ensure_window(self) -> None:
@@ -165,7 +199,9 @@ class OverlayWindow:
         self.slot_canvases.clear()
         self.fill_rects.clear()
         self.icons.clear()
+        self._icon_keys.clear()
         self.progress.clear()
+        self._cancel_progress_tick()
         self.win = tk.Toplevel(self.root, bg=BG)
         self.win.withdraw()
         self.win.overrideredirect(True)
@@ -339,31 +375,27 @@ class OverlayWindow:
         canvas.coords(rect_id, 0, 0, OVERLAY_ICON_SIZE[0], height)
         canvas.itemconfigure(rect_id, state=tk.NORMAL if height > 0 else tk.HIDDEN)
 
-    def _cancel_progress(self, slot: str) -> None:
-        data = self.progress.pop(slot, None)
-        if data is None:
-            return
-        job = data.get("job")
+    def _cancel_progress_tick(self) -> None:
+        job, self._progress_job = self._progress_job, None
         if job is not None:
             try:
                 self.root.after_cancel(job)
-            except Exception:
+            except tk.TclError:
                 pass
 
-    def _tick_progress(self, slot: str) -> None:
-        data = self.progress.get(slot)
-        if data is None:
-            return
-        duration = float(data["duration"])
-        start_ts = float(data["start"])
-        elapsed = max(0.0, time.time() - start_ts)
-        progress = min(1.0, elapsed / duration) if duration > 0 else 1.0
-        self._set_fill(slot, progress)
-        if progress >= 1.0:
-            self._cancel_progress(slot)
-            self._set_fill(slot, 0)
-            return
-        data["job"] = self.root.after(50, lambda s=slot: self._tick_progress(s))
+    def _tick_progress(self) -> None:
+        """Advance every running fill in one pass; reschedules only while any remain."""
+        self._progress_job = None
+        now = time.perf_counter()
+        for slot, (start_ts, duration) in list(self.progress.items()):
+            progress = (now - start_ts) / duration
+            if progress >= 1.0:
+                del self.progress[slot]
+                self._set_fill(slot, 0)
+            else:
+                self._set_fill(slot, progress)
+        if self.progress:
+            self._progress_job = self.root.after(PROGRESS_TICK_MS, self._tick_progress)
 
     # -- Events ------------------------------------------------------------ #
     def _overlay_event_target(self, event) -> tk.Widget | None:  # noqa: ANN001
@@ -5,7 +5,7 @@ from __future__ import annotations
 import platform
 import sys
 import tkinter as tk
-from typing import Iterable
+from typing import Any, Iterable
 
 BG = "#121212"
 FG = "#e5e5e5"
@@ -16,72 +16,87 @@ ACCENT = "#4e8cff"
 MENU_BG = "#161616"
 IS_WINDOWS = platform.system() == "Windows"
 
+# Full palette per widget class, applied with one configure call. Classes not
+# listed get _DEFAULT_OPTS.
+_DEFAULT_OPTS: dict[str, Any] = {"bg": BG, "fg": FG}
+_BG_ONLY: dict[str, Any] = {"bg": BG}
+_CLASS_OPTS: dict[str, dict[str, Any]] = {
+    "Button": {
+        "bg": BUTTON_BG,
+        "fg": FG,
+        "activebackground": BUTTON_ACTIVE,
+        "activeforeground": FG,
+        "highlightthickness": 0,
+        "bd": 1,
+    },
+    "Label": _DEFAULT_OPTS,
+    "Frame": _BG_ONLY,
+    "TFrame": {},
+    "Tk": _BG_ONLY,
+    "Toplevel": _BG_ONLY,
+    "Canvas": _BG_ONLY,
+    "Entry": {
+        "bg": ENTRY_BG,
+        "fg": FG,
+        "insertbackground": FG,
+        "disabledforeground": "#777777",
+    },
+    "Listbox": {
+        "bg": ENTRY_BG,
+        "fg": FG,
+        "selectbackground": ACCENT,
+        "selectforeground": FG,
+        "highlightthickness": 0,
+        "relief": tk.FLAT,
+    },
+    "Scrollbar": {
+        "bg": BG,
+        "troughcolor": BUTTON_BG,
+        "activebackground": BUTTON_ACTIVE,
+        "highlightthickness": 0,
+    },
+}
 
 def apply_dark_theme(widget: tk.Misc) -> None:
-    """Recursively apply a dark palette to a widget tree."""
-    cls = widget.winfo_class()
-    try:
-        widget.configure(bg=BG)
-    except tk.TclError:
-        pass
+    """Recursively apply a dark palette to a widget tree.
 
-    try:
-        widget.configure(fg=FG)
-    except tk.TclError:
-        pass
+    Windows (Tk/Toplevel) are only walked once; widgets created afterwards pick
+    up the palette from the option database set in init_base_theme.
+    """
+    if isinstance(widget, (tk.Tk, tk.Toplevel)):
+        # Flag lives on the window object, so it goes away with the window.
+        if getattr(widget, "_dark_themed", False):
+            return
+        widget._dark_themed = True  # type: ignore[attr-defined]
+    _apply_dark_theme_tree(widget)
 
-    if cls == "Button":
-        try:
-            widget.configure(
-                bg=BUTTON_BG,
-                fg=FG,
-                activebackground=BUTTON_ACTIVE,
-                activeforeground=FG,
-                highlightthickness=0,
-                bd=1,
-            )
-        except tk.TclError:
-            pass
-    elif cls == "Label":
-        try:
-            widget.configure(bg=BG, fg=FG)
-        except tk.TclError:
-            pass
-    elif cls in ("Frame", "TFrame"):
-        try:
-            widget.configure(bg=BG)
-        except tk.TclError:
-            pass
-    elif cls == "Entry":
-        try:
-            widget.configure(
-                bg=ENTRY_BG,
-                fg=FG,
-                insertbackground=FG,
-                disabledforeground="#777777",
-            )
-        except tk.TclError:
-            pass
-    elif cls == "Listbox":
-        try:
-            widget.configure(
-                bg=ENTRY_BG,
-                fg=FG,
-                selectbackground=ACCENT,
-                selectforeground=FG,
-                highlightthickness=0,
-                relief=tk.FLAT,
-            )
-        except tk.TclError:
-            pass
-    elif cls == "Scrollbar":
+
+def keep_own_colors(widget: tk.Misc) -> None:
+    """Exclude widget and its children from apply_dark_theme walks.
+
+    For subtrees styled through their own option-database entries, which the
+    per-class palette would otherwise overwrite.
+    """
+    widget._keeps_own_colors = True  # type: ignore[attr-defined]
+
+
+def _apply_dark_theme_tree(widget: tk.Misc) -> None:
+    if getattr(widget, "_keeps_own_colors", False):
+        return
+    opts = _CLASS_OPTS.get(widget.winfo_class(), _DEFAULT_OPTS)
+    if opts:
         try:
-            widget.configure(bg=BG, troughcolor=BUTTON_BG, activebackground=BUTTON_ACTIVE, highlightthickness=0)
+            widget.configure(**opts)
         except tk.TclError:
-            pass
+            # Unknown classes may not take fg; background alone still applies.
+            if opts is _DEFAULT_OPTS:
+                try:
+                    widget.configure(bg=BG)
+                except tk.TclError:
+                    pass
 
     for child in widget.winfo_children():
-        apply_dark_theme(child)
+        _apply_dark_theme_tree(child)
 
 
 def init_base_theme(root: tk.Tk) -> None:
@@ -91,11 +106,23 @@ def init_base_theme(root: tk.Tk) -> None:
     root.option_add("*Foreground", FG)
     root.option_add("*Button.Background", BUTTON_BG)
     root.option_add("*Button.Foreground", FG)
+    root.option_add("*Button.activeBackground", BUTTON_ACTIVE)
+    root.option_add("*Button.activeForeground", FG)
+    root.option_add("*Button.highlightThickness", 0)
     root.option_add("*Entry.Background", ENTRY_BG)
     root.option_add("*Entry.Foreground", FG)
     root.option_add("*Entry.InsertBackground", FG)
+    root.option_add("*Entry.disabledForeground", "#777777")
     root.option_add("*Listbox.Background", ENTRY_BG)
     root.option_add("*Listbox.Foreground", FG)
+    root.option_add("*Listbox.selectBackground", ACCENT)
+    root.option_add("*Listbox.selectForeground", FG)
+    root.option_add("*Listbox.highlightThickness", 0)
+    root.option_add("*Listbox.relief", tk.FLAT)
+    root.option_add("*Scrollbar.Background", BG)
+    root.option_add("*Scrollbar.troughColor", BUTTON_BG)
+    root.option_add("*Scrollbar.activeBackground", BUTTON_ACTIVE)
+    root.option_add("*Scrollbar.highlightThickness", 0)
     root.option_add("*Menu.Background", MENU_BG)
     root.option_add("*Menu.Foreground", FG)
     root.option_add("*Menu.activeBackground", BUTTON_ACTIVE)
@@ -127,58 +154,98 @@ def _hex_to_colorref(hex_color: str) -> int:
     return (b << 16) | (g << 8) | r  # COLORREF is 0x00bbggrr
 
 
+class _DarkModeApi:
+    """ctypes prototypes for the dark title bar calls, bound once per process."""
+
+    __slots__ = ("get_ancestor", "set_window_attribute", "allow_dark_window", "app_calls")
+
+    def __init__(self) -> None:
+        import ctypes
+        from ctypes import wintypes
+
+        self.get_ancestor = ctypes.windll.user32.GetAncestor
+        self.get_ancestor.argtypes = (wintypes.HWND, ctypes.c_uint)
+        self.get_ancestor.restype = wintypes.HWND
+
+        self.set_window_attribute = ctypes.windll.dwmapi.DwmSetWindowAttribute
+        self.set_window_attribute.argtypes = (wintypes.HWND, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD)
+        self.set_window_attribute.restype = ctypes.c_long
+
+        def _bind(name: str, *argtypes: Any) -> Any:
+            try:
+                func = getattr(ctypes.windll.uxtheme, name)
+            except (AttributeError, OSError):
+                return None
+            func.argtypes = argtypes
+            func.restype = wintypes.BOOL
+            return func
+
+        self.allow_dark_window = _bind("AllowDarkModeForWindow", wintypes.HWND, wintypes.BOOL)
+        # App-wide mode switches; these only need to run once per process.
+        # 0=Default, 1=AllowDark, 2=ForceDark (depends on build)
+        self.app_calls: list[tuple[Any, tuple[Any, ...]]] = []
+        for name, argtypes, args in (
+            ("SetPreferredAppMode", (ctypes.c_int,), (2,)),
+            ("AllowDarkModeForApp", (wintypes.BOOL,), (True,)),
+            ("RefreshImmersiveColorPolicyState", (), ()),
+            ("FlushMenuThemes", (), ()),
+        ):
+            func = _bind(name, *argtypes)
+            if func is not None:
+                self.app_calls.append((func, args))
+
+
+_dark_api: _DarkModeApi | None = None
+_app_dark_mode_set = False
+
+
+def _get_dark_api() -> _DarkModeApi:
+    global _dark_api
+    if _dark_api is None:
+        _dark_api = _DarkModeApi()
+    return _dark_api
+
+
 def set_dark_titlebar(win: tk.Tk | tk.Toplevel) -> None:
     """On Windows, request a dark title bar; no-op elsewhere."""
+    global _app_dark_mode_set
     if not IS_WINDOWS:
         return
     try:
         import ctypes
         from ctypes import wintypes
 
+        api = _get_dark_api()
         win.update_idletasks()
-        hwnd = wintypes.HWND(win.winfo_id())
-        user32 = ctypes.windll.user32
+        hwnd = win.winfo_id()
         GA_ROOT = 2  # GetAncestor flag for root window
-        root_hwnd = user32.GetAncestor(hwnd, GA_ROOT)
+        root_hwnd = api.get_ancestor(hwnd, GA_ROOT)
         if root_hwnd:
-            hwnd = wintypes.HWND(root_hwnd)
+            hwnd = root_hwnd
 
         # Ask the OS to allow dark chrome even if system setting is light.
-        try:
-            uxtheme = ctypes.windll.uxtheme
-
-            def _call(func_name: str, *args) -> bool:
-                func = getattr(uxtheme, func_name, None)
-                if func is None:
-                    return False
-                func.restype = wintypes.BOOL
-                func.argtypes = [type(arg) for arg in args]
+        if not _app_dark_mode_set:
+            for func, args in api.app_calls:
                 try:
                     func(*args)
-                    return True
                 except Exception:
-                    return False
-
-            # 0=Default, 1=AllowDark, 2=ForceDark (depends on build)
-            _call("SetPreferredAppMode", ctypes.c_int(2))
-            _call("AllowDarkModeForApp", wintypes.BOOL(True))
-            _call("AllowDarkModeForWindow", hwnd, wintypes.BOOL(True))
-            _call("RefreshImmersiveColorPolicyState")
-            _call("FlushMenuThemes")
-        except Exception:
-            pass
+                    pass
+            _app_dark_mode_set = True
+        if api.allow_dark_window is not None:
+            try:
+                api.allow_dark_window(hwnd, True)
+            except Exception:
+                pass
+
+        set_attr = api.set_window_attribute
 
         def _set_attr(attr: int, val: int) -> None:
             value = wintypes.BOOL(val) if isinstance(val, bool) or val in (0, 1) else ctypes.c_int(val)
-            ctypes.windll.dwmapi.DwmSetWindowAttribute(
-                hwnd, ctypes.c_uint(attr), ctypes.byref(value), ctypes.sizeof(value)
-            )
+            set_attr(hwnd, attr, ctypes.byref(value), ctypes.sizeof(value))
 
         def _set_color_attr(attr: int, hex_color: str) -> None:
             color = wintypes.DWORD(_hex_to_colorref(hex_color))
-            ctypes.windll.dwmapi.DwmSetWindowAttribute(
-                hwnd, ctypes.c_uint(attr), ctypes.byref(color), ctypes.sizeof(color)
-            )
+            set_attr(hwnd, attr, ctypes.byref(color), ctypes.sizeof(color))
 
         # Windows 10/11 dark mode attribute (19 for 1809, 20 for 1903+).
         build = sys.getwindowsversion().build